@@ -27,6 +27,12 @@ debounceMs = 300  # Debounce delay
 while True:
     currentTime = time.ticks_ms()
     
+    # Answer the host's readiness check so it doesn't have to wait a fixed delay
+    if uart.any():
+        line = uart.readline()
+        if line and line.strip() == b"PING":
+            uart.write("PONG\n")
+    
     # Check for button presses with debounce
     if currentTime - lastPressTime > debounceMs:
         if button_a.is_pressed() and button_b.is_pressed():
@@ -27,16 +27,27 @@ class QueueAnalyticsDashboard:
     - Enhanced academic insights
     """
     
-    def __init__(self, db_path='poQueueSim.db'):
+    def __init__(self, db_path='poQueueSim.db', read_only=False):
         """Initialize connection to SQLite database"""
         self.db_path = db_path
+        self.read_only = read_only
         self.conn = None
         self.connect()
     
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            if self.read_only:
+                # Read-only URI so dashboard reads never take a write lock on the simulator's database;
+                # the connection is shared by the chart worker threads
+                self.conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True,
+                                            check_same_thread=False)
+                self.conn.executescript('''
+                    PRAGMA query_only=1;
+                    PRAGMA mmap_size=268435456;
+                ''')
+            else:
+                self.conn = sqlite3.connect(self.db_path)
             print(f"✓ Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             print(f"✗ Database connection error: {e}")
@@ -55,14 +66,14 @@ class QueueAnalyticsDashboard:
         """
         query = f"""
         SELECT 
-            DATE(recorded_date) as date,
+            date(timestamp, 'unixepoch', 'localtime') as date,
             AVG(queue_length) as avg_queue_length,
             COUNT(*) as total_events,
             SUM(CASE WHEN event_type = 'arrival' THEN 1 ELSE 0 END) as arrivals,
             SUM(CASE WHEN event_type = 'service_complete' THEN 1 ELSE 0 END) as completions
         FROM events
-        WHERE recorded_date >= date('now', '-{days} days')
-        GROUP BY DATE(recorded_date)
+        WHERE timestamp >= CAST(strftime('%s', date('now', '-{days} days'), 'utc') AS REAL)
+        GROUP BY date
         ORDER BY date
         """
         
@@ -150,8 +161,8 @@ class QueueAnalyticsDashboard:
         """Create heatmap showing customer arrival patterns by day and hour"""
         query = """
         SELECT 
-            strftime('%w', recorded_date) as day_of_week,
-            strftime('%H', recorded_date) as hour,
+            strftime('%w', timestamp, 'unixepoch', 'localtime') as day_of_week,
+            strftime('%H', timestamp, 'unixepoch', 'localtime') as hour,
             COUNT(*) as arrivals
         FROM events
         WHERE event_type = 'arrival'
@@ -234,6 +245,28 @@ class QueueAnalyticsDashboard:
             print(f"Error in get_strategy_comparison: {e}")
             return pd.DataFrame()
     
+    def get_strategy_chart_data(self):
+        """
+        Strategy comparison as plain lists for native (QtCharts) bar charts
+        Returns: (strategies, [(title, unit, values, color), ...])
+        """
+        df = self.get_strategy_comparison()
+        
+        if df.empty:
+            return [], []
+        
+        metrics = [
+            ('Average Wait Time', 'Minutes', 'mean_wait_time', '#add8e6'),
+            ('Server Utilization', 'Percent', 'avg_utilization_pct', '#90ee90'),
+            ('Throughput', 'Customers', 'avg_throughput', '#ffa500'),
+            ('Abandonment Rate', 'Percent', 'avg_abandonment_pct', '#fa8072')
+        ]
+        
+        return df['dispatch_strategy'].tolist(), [
+            (title, unit, df[column].fillna(0).astype(float).tolist(), color)
+            for title, unit, column, color in metrics
+        ]
+    
     def plot_strategy_comparison(self):
         """Create grouped bar chart comparing dispatch strategies"""
         df = self.get_strategy_comparison()
@@ -788,31 +821,57 @@ class QueueAnalyticsDashboard:
         
         return fig
     
-    def plot_wait_time_histogram(self):
-        """Create histogram of wait time distribution"""
+    def get_wait_time_histogram(self, bins=20):
+        """
+        Bin average wait times per strategy on shared edges
+        Returns: (edges, {strategy: counts}) with plain lists; edges is empty when there is no data
+        """
         query = """
         SELECT r.avg_wait_time, sr.dispatch_strategy
         FROM results r
         JOIN simulation_runs sr ON r.run_id = sr.run_id
         """
         
+        rows = self.conn.execute(query).fetchall()
+        
+        if not rows:
+            return [], {}
+        
+        # Bin in numpy so callers get `bins` counts per strategy, not every run
+        waits = np.array([row[0] for row in rows], dtype=float)
+        strategies = np.array([row[1] for row in rows])
+        valid = ~np.isnan(waits)
+        edges = np.histogram_bin_edges(waits[valid], bins=bins)
+        
+        counts = {}
+        for strategy in np.unique(strategies):
+            strategy_counts, _ = np.histogram(waits[valid & (strategies == strategy)], bins=edges)
+            counts[str(strategy)] = strategy_counts.tolist()
+        
+        return edges.tolist(), counts
+    
+    def plot_wait_time_histogram(self):
+        """Create histogram of wait time distribution"""
         try:
-            df = pd.read_sql_query(query, self.conn)
+            edges, counts = self.get_wait_time_histogram()
             
-            if df.empty:
+            if not edges:
                 fig = go.Figure()
                 fig.add_annotation(text="No data available", x=0.5, y=0.5, showarrow=False)
                 return fig
             
+            edges = np.array(edges)
+            centers = (edges[:-1] + edges[1:]) / 2
+            
             fig = go.Figure()
             
-            for strategy in df['dispatch_strategy'].unique():
-                strategy_data = df[df['dispatch_strategy'] == strategy]
-                fig.add_trace(go.Histogram(
-                    x=strategy_data['avg_wait_time'],
+            for strategy, strategy_counts in counts.items():
+                fig.add_trace(go.Bar(
+                    x=centers,
+                    y=strategy_counts,
+                    width=np.diff(edges),
                     name=strategy,
-                    opacity=0.7,
-                    nbinsx=20
+                    opacity=0.7
                 ))
             
             fig.update_layout(
@@ -837,12 +896,20 @@ class QueueAnalyticsDashboard:
         kpis = {}
         
         try:
-            # Original KPIs
+            # Original KPIs, aggregated in a single pass over the results table
+            query = """
+            SELECT 
+                AVG(avg_wait_time) as avg_wait,
+                AVG(server_utilization) * 100 as utilization,
+                AVG(abandonment_rate) * 100 as abandonment,
+                SUM(customers_served) as total_served
+            FROM results
+            """
+            row = self.conn.execute(query).fetchone()
+            avg_wait, utilization, abandonment, total_served = row if row else (None, None, None, None)
+            
             # KPI 1: Average Wait Time
-            query = "SELECT AVG(avg_wait_time) FROM results"
-            result = pd.read_sql_query(query, self.conn)
-            if not result.empty and result.iloc[0, 0] is not None:
-                avg_wait = result.iloc[0, 0]
+            if avg_wait is not None:
                 kpis['average_wait_time'] = {
                     'value': round(avg_wait, 2),
                     'target': 5.0,
@@ -851,10 +918,7 @@ class QueueAnalyticsDashboard:
                 }
             
             # KPI 2: Server Utilization
-            query = "SELECT AVG(server_utilization) * 100 FROM results"
-            result = pd.read_sql_query(query, self.conn)
-            if not result.empty and result.iloc[0, 0] is not None:
-                utilization = result.iloc[0, 0]
+            if utilization is not None:
                 kpis['server_utilization'] = {
                     'value': round(utilization, 1),
                     'target': '70-85%',
@@ -863,10 +927,7 @@ class QueueAnalyticsDashboard:
                 }
             
             # KPI 3: Abandonment Rate
-            query = "SELECT AVG(abandonment_rate) * 100 FROM results"
-            result = pd.read_sql_query(query, self.conn)
-            if not result.empty and result.iloc[0, 0] is not None:
-                abandonment = result.iloc[0, 0]
+            if abandonment is not None:
                 kpis['abandonment_rate'] = {
                     'value': round(abandonment, 2),
                     'target': '<5%',
@@ -875,11 +936,9 @@ class QueueAnalyticsDashboard:
                 }
             
             # KPI 4: Total Customers Served
-            query = "SELECT SUM(customers_served) FROM results"
-            result = pd.read_sql_query(query, self.conn)
-            if not result.empty and result.iloc[0, 0] is not None:
+            if total_served is not None:
                 kpis['total_served'] = {
-                    'value': int(result.iloc[0, 0]),
+                    'value': int(total_served),
                     'unit': 'customers',
                     'status': 'INFO'
                 }
@@ -9,12 +9,107 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QScrollArea, QGroupBox, QGridLayout, QMessageBox,
                              QFrame)
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import Qt, QUrl, QTimer, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor
-import os
-import tempfile
+from PyQt5.QtChart import (QChart, QChartView, QBarSeries, QBarSet,
+                           QBarCategoryAxis, QValueAxis)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QRunnable, QThreadPool
+from PyQt5.QtGui import QFont, QPalette, QColor, QPainter
 from analyticsDashboard import QueueAnalyticsDashboard  # Updated dashboard
 
+# KPI card styling, built once rather than per card refresh
+_KPI_STATUS_COLORS = {
+    'EXCELLENT': '#28a745',
+    'OPTIMAL': '#28a745', 
+    'GOOD': '#17a2b8',
+    'MONITOR': '#ffc107',
+    'WARNING': '#fd7e14',
+    'CRITICAL': '#dc3545',
+    'INFO': '#6f42c1'
+}
+_KPI_DEFAULT_COLOR = '#6c757d'
+
+_KPI_CARD_STYLE = """
+    QGroupBox {{
+        background: white;
+        border: 2px solid {color};
+        border-radius: 10px;
+        margin: 5px;
+        padding: 15px;
+        max-width: 300px;
+        min-height: 120px;
+    }}
+    QGroupBox::title {{
+        color: {color};
+        font-weight: bold;
+        font-size: 14px;
+    }}
+"""
+_KPI_VALUE_STYLE = "color: {color}; font-size: 28px; font-weight: bold; margin: 10px 0;"
+_KPI_STATUS_STYLE = "background: {color}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px;"
+_KPI_TARGET_STYLE = "font-size: 10px; color: #6c757d;"
+
+
+def _kpi_styles(color):
+    """Card, value and status stylesheets for one status colour"""
+    return (color,
+            _KPI_CARD_STYLE.format(color=color),
+            _KPI_VALUE_STYLE.format(color=color),
+            _KPI_STATUS_STYLE.format(color=color))
+
+
+# Status -> (color, card style, value style, status style), so refreshes are dict lookups
+_KPI_STYLE_CACHE = {status: _kpi_styles(color) for status, color in _KPI_STATUS_COLORS.items()}
+_KPI_DEFAULT_STYLES = _kpi_styles(_KPI_DEFAULT_COLOR)
+
+
+class ChartSignals(QObject):
+    """Signals emitted by chart workers back to the GUI thread"""
+    chart_ready = pyqtSignal(str, str)  # div id, HTML page or Plotly.react script
+    data_ready = pyqtSignal(str, object)  # dashboard method name, its result
+
+
+class ChartWorker(QRunnable):
+    """Builds one Plotly figure off the GUI thread"""
+    
+    def __init__(self, dashboard, plot_name, div_id, first_load):
+        super().__init__()
+        self.dashboard = dashboard
+        self.plot_name = plot_name
+        self.div_id = div_id
+        self.first_load = first_load
+        self.signals = ChartSignals()
+    
+    def run(self):
+        """Query the database and serialise the figure for the web view"""
+        try:
+            fig = getattr(self.dashboard, self.plot_name)()
+            if self.first_load:
+                payload = fig.to_html(include_plotlyjs='cdn', full_html=True, div_id=self.div_id)
+            else:
+                payload = f"var fig = {fig.to_json()}; Plotly.react('{self.div_id}', fig.data, fig.layout);"
+        except Exception as e:
+            print(f"Error building {self.plot_name}: {e}")
+            return
+        self.signals.chart_ready.emit(self.div_id, payload)
+
+
+class DataWorker(QRunnable):
+    """Runs one dashboard query off the GUI thread for a native chart"""
+    
+    def __init__(self, dashboard, method_name):
+        super().__init__()
+        self.dashboard = dashboard
+        self.method_name = method_name
+        self.signals = ChartSignals()
+    
+    def run(self):
+        """Fetch the data; the GUI thread builds the chart from it"""
+        try:
+            data = getattr(self.dashboard, self.method_name)()
+        except Exception as e:
+            print(f"Error loading {self.method_name}: {e}")
+            return
+        self.signals.data_ready.emit(self.method_name, data)
+
 
 class AnalyticsWindow(QMainWindow):
     """
@@ -26,7 +121,12 @@ class AnalyticsWindow(QMainWindow):
         super().__init__(parent)
         self.db_path = db_path
         self.dashboard = None
-        self.temp_dir = tempfile.mkdtemp()
+        self.kpi_cards = {}     # KPI name -> card widgets, built on first load
+        self.chart_divs = {}    # view -> Plotly div id
+        self.chart_views = {}   # Plotly div id -> view
+        self.loaded_divs = set()  # div ids whose page (and plotly.js) has finished loading
+        self.data_handlers = {}   # dashboard method name -> slot filling a native chart
+        self.thread_pool = QThreadPool.globalInstance()
         
         self.init_ui()
         self.load_analytics()
@@ -98,6 +198,18 @@ class AnalyticsWindow(QMainWindow):
         
         main_layout.addWidget(self.tabs)
         
+        # Tabs are only rendered when shown; refresh marks them all stale
+        self.tab_loaders = [
+            self.load_kpis,
+            self.load_trends,
+            self.load_strategy_analysis,
+            self.load_littles_law_analysis,
+            self.load_wellbeing_analysis,
+            self.load_advanced_insights,
+        ]
+        self.tab_dirty = [True] * len(self.tab_loaders)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        
         # Status bar
         self.statusBar().showMessage('Enhanced analytics dashboard ready')
         self.statusBar().setStyleSheet("background-color: #e9ecef; padding: 5px;")
@@ -218,8 +330,14 @@ class AnalyticsWindow(QMainWindow):
         info_label.setWordWrap(True)
         strategy_layout.addWidget(info_label)
         
-        self.strategy_view = QWebEngineView()
-        strategy_layout.addWidget(self.strategy_view)
+        # One native bar chart per metric
+        charts_layout = QGridLayout()
+        self.strategy_charts = []
+        for i in range(4):
+            chart_view = self.create_chart_view()
+            charts_layout.addWidget(chart_view, i // 2, i % 2)
+            self.strategy_charts.append(chart_view.chart())
+        strategy_layout.addLayout(charts_layout)
         
         self.tabs.addTab(strategy_widget, '⚖️ Strategy Analysis')
     
@@ -376,92 +494,194 @@ mathematical modeling, and human-centered system design.
         self.util_view.setMaximumHeight(400)
         insights_layout.addWidget(self.util_view)
         
-        self.wait_view = QWebEngineView()
-        self.wait_view.setMaximumHeight(400)
-        insights_layout.addWidget(self.wait_view)
+        wait_chart_view = self.create_chart_view()
+        wait_chart_view.setMaximumHeight(400)
+        insights_layout.addWidget(wait_chart_view)
+        self.wait_chart = wait_chart_view.chart()
         
         insights_layout.addStretch()
         
         self.tabs.addTab(insights_widget, '🎓 Advanced Insights')
     
-    def create_kpi_card(self, kpi_name, kpi_data):
-        """Create enhanced KPI display card"""
+    def create_kpi_card(self, kpi_name):
+        """Create enhanced KPI display card; contents are filled in by update_kpi_card"""
         card = QGroupBox()
         card_layout = QVBoxLayout(card)
         
-        # Status color mapping
-        status_colors = {
-            'EXCELLENT': '#28a745',
-            'OPTIMAL': '#28a745', 
-            'GOOD': '#17a2b8',
-            'MONITOR': '#ffc107',
-            'WARNING': '#fd7e14',
-            'CRITICAL': '#dc3545',
-            'INFO': '#6f42c1'
-        }
-        
-        status_color = status_colors.get(kpi_data.get('status', 'INFO'), '#6c757d')
-        
-        card.setStyleSheet(f"""
-            QGroupBox {{
-                background: white;
-                border: 2px solid {status_color};
-                border-radius: 10px;
-                margin: 5px;
-                padding: 15px;
-                max-width: 300px;
-                min-height: 120px;
-            }}
-            QGroupBox::title {{
-                color: {status_color};
-                font-weight: bold;
-                font-size: 14px;
-            }}
-        """)
-        
         # KPI name as title
         card.setTitle(kpi_name.replace('_', ' ').title())
         
         # Value display
-        value_label = QLabel(f"{kpi_data['value']} {kpi_data.get('unit', '')}")
-        value_label.setStyleSheet(f"color: {status_color}; font-size: 28px; font-weight: bold; margin: 10px 0;")
+        value_label = QLabel()
         value_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(value_label)
         
         # Status and target
         details_layout = QHBoxLayout()
         
-        if kpi_data.get('status'):
-            status_label = QLabel(kpi_data['status'])
-            status_label.setStyleSheet(f"background: {status_color}; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px;")
-            details_layout.addWidget(status_label)
+        status_label = QLabel()
+        details_layout.addWidget(status_label)
         
         details_layout.addStretch()
         
-        if kpi_data.get('target'):
-            target_label = QLabel(f"Target: {kpi_data['target']}")
-            target_label.setStyleSheet("font-size: 10px; color: #6c757d;")
-            details_layout.addWidget(target_label)
+        target_label = QLabel()
+        target_label.setStyleSheet(_KPI_TARGET_STYLE)
+        details_layout.addWidget(target_label)
         
         card_layout.addLayout(details_layout)
         
-        return card
+        return {'box': card, 'value': value_label, 'status': status_label,
+                'target': target_label, 'color': None}
+    
+    def update_kpi_card(self, card, kpi_data):
+        """Refresh a KPI card's labels, restyling it only when its status colour changes"""
+        status_color, card_style, value_style, status_style = _KPI_STYLE_CACHE.get(
+            kpi_data.get('status', 'INFO'), _KPI_DEFAULT_STYLES)
+        
+        if status_color != card['color']:
+            card['color'] = status_color
+            card['box'].setStyleSheet(card_style)
+            card['value'].setStyleSheet(value_style)
+            card['status'].setStyleSheet(status_style)
+        
+        card['value'].setText(f"{kpi_data['value']} {kpi_data.get('unit', '')}")
+        
+        card['status'].setText(kpi_data.get('status') or '')
+        card['status'].setVisible(bool(kpi_data.get('status')))
+        
+        card['target'].setText(f"Target: {kpi_data.get('target')}")
+        card['target'].setVisible(bool(kpi_data.get('target')))
+    
+    def create_chart_view(self):
+        """Create an empty native chart view"""
+        chart = QChart()
+        chart.setAnimationOptions(QChart.NoAnimation)
+        chart_view = QChartView(chart)
+        chart_view.setRenderHint(QPainter.Antialiasing)
+        chart_view.setMinimumHeight(250)
+        return chart_view
+    
+    def fill_bar_chart(self, chart, title, categories, bar_sets, y_title=''):
+        """Replace a chart's contents with grouped bars; bar_sets is [(name, values, color), ...]"""
+        chart.removeAllSeries()
+        for axis in chart.axes():
+            chart.removeAxis(axis)
+        chart.setTitle(title)
+        
+        if not categories:
+            chart.legend().hide()
+            return
+        
+        series = QBarSeries()
+        max_value = 0
+        for name, values, color in bar_sets:
+            bar_set = QBarSet(name)
+            bar_set.append([float(value) for value in values])
+            if color:
+                bar_set.setColor(QColor(color))
+            series.append(bar_set)
+            max_value = max([max_value] + list(values))
+        chart.addSeries(series)
+        
+        x_axis = QBarCategoryAxis()
+        x_axis.append(categories)
+        chart.addAxis(x_axis, Qt.AlignBottom)
+        series.attachAxis(x_axis)
+        
+        y_axis = QValueAxis()
+        y_axis.setRange(0, max_value * 1.1 if max_value else 1)
+        y_axis.setTitleText(y_title)
+        chart.addAxis(y_axis, Qt.AlignLeft)
+        series.attachAxis(y_axis)
+        
+        chart.legend().setVisible(len(bar_sets) > 1)
+    
+    def show_data(self, method_name, handler):
+        """Run a dashboard query in the thread pool and pass the result to handler"""
+        self.data_handlers[method_name] = handler
+        worker = DataWorker(self.dashboard, method_name)
+        worker.signals.data_ready.connect(self.on_data_ready)
+        self.thread_pool.start(worker)
+    
+    def on_data_ready(self, method_name, data):
+        """Hand query results from a data worker to their chart"""
+        self.data_handlers[method_name](data)
+    
+    def update_strategy_charts(self, data):
+        """Fill the strategy comparison charts"""
+        strategies, metrics = data
+        
+        if not strategies:
+            for chart in self.strategy_charts:
+                self.fill_bar_chart(chart, 'No simulation data available', [], [])
+            return
+        
+        for chart, (title, unit, values, color) in zip(self.strategy_charts, metrics):
+            self.fill_bar_chart(chart, title, strategies, [(title, values, color)], unit)
+    
+    def update_wait_chart(self, data):
+        """Fill the wait time distribution chart"""
+        edges, counts = data
+        
+        if not edges:
+            self.fill_bar_chart(self.wait_chart, 'No data available', [], [])
+            return
+        
+        categories = [f"{lo:.1f}-{hi:.1f}" for lo, hi in zip(edges, edges[1:])]
+        self.fill_bar_chart(
+            self.wait_chart, 'Wait Time Distribution by Strategy', categories,
+            [(strategy, strategy_counts, None) for strategy, strategy_counts in counts.items()],
+            'Frequency'
+        )
+    
+    def show_figure(self, view, plot_name):
+        """Build a dashboard figure in the thread pool and display it in the given view"""
+        div_id = self.chart_divs.get(view)
+        if div_id is None:
+            div_id = f'chart_{len(self.chart_divs)}'
+            self.chart_divs[view] = div_id
+            self.chart_views[div_id] = view
+            view.loadFinished.connect(lambda ok, div_id=div_id: self.on_chart_loaded(div_id, ok))
+        
+        worker = ChartWorker(self.dashboard, plot_name, div_id, div_id not in self.loaded_divs)
+        worker.signals.chart_ready.connect(self.on_chart_ready)
+        self.thread_pool.start(worker)
+    
+    def on_chart_ready(self, div_id, payload):
+        """Display a figure built by a chart worker"""
+        view = self.chart_views[div_id]
+        if payload.startswith('<'):
+            # First load: the page pulls plotly.js from the CDN, which also keeps it
+            # under setHtml's 2 MB limit (inlining the library would exceed it). Until the
+            # page reports loadFinished, refreshes send a whole page again, since
+            # Plotly.react would be lost on a page where Plotly isn't defined yet
+            self.loaded_divs.discard(div_id)
+            view.setHtml(payload)
+        else:
+            # Refresh: push the new traces and layout into the already loaded chart
+            view.page().runJavaScript(payload)
+    
+    def on_chart_loaded(self, div_id, ok):
+        """Track whether a chart's page is ready to take Plotly.react updates"""
+        if ok:
+            self.loaded_divs.add(div_id)
+        else:
+            self.loaded_divs.discard(div_id)
     
     def load_analytics(self):
         """Load all analytics data including new features"""
         try:
             self.statusBar().showMessage('🔄 Loading analytics...')
             
-            # Initialize dashboard
-            self.dashboard = QueueAnalyticsDashboard(self.db_path)
+            # Initialize dashboard (one read-only connection shared with the chart workers)
+            if self.dashboard:
+                self.thread_pool.waitForDone()  # workers may still be reading the old connection
+                self.dashboard.close()
+            self.dashboard = QueueAnalyticsDashboard(self.db_path, read_only=True)
             
-            # Load all analytics
-            self.load_kpis()
-            self.load_trends()
-            self.load_strategy_analysis()
-            self.load_littles_law_analysis()     # NEW
-            self.load_wellbeing_analysis()       # NEW
-            self.load_advanced_insights()        # NEW
+            # Invalidate every tab, then render only the one being viewed
+            self.tab_dirty = [True] * len(self.tab_loaders)
+            self.on_tab_changed(self.tabs.currentIndex())
             
             self.statusBar().showMessage('✅ Analytics loaded successfully')
             
@@ -469,43 +689,41 @@ mathematical modeling, and human-centered system design.
             self.statusBar().showMessage(f'❌ Error loading analytics: {str(e)}')
             QMessageBox.warning(self, 'Error', f'Failed to load analytics:\n{str(e)}')
     
+    def on_tab_changed(self, index):
+        """Render a tab the first time it is shown after a refresh"""
+        if self.dashboard is None or not (0 <= index < len(self.tab_loaders)):
+            return
+        if self.tab_dirty[index]:
+            self.tab_dirty[index] = False
+            self.tab_loaders[index]()
+    
     def load_kpis(self):
         """Load and display enhanced KPI cards"""
-        # Clear existing KPIs
-        for i in reversed(range(self.kpi_grid.count())): 
-            widget = self.kpi_grid.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
         # Get enhanced KPI data
         kpis = self.dashboard.get_kpi_summary()
         
-        # Create KPI cards
-        row = 0
-        col = 0
+        # Cards are created the first time a KPI appears and reused afterwards
         for kpi_name, kpi_data in kpis.items():
-            kpi_card = self.create_kpi_card(kpi_name, kpi_data)
-            self.kpi_grid.addWidget(kpi_card, row, col)
-            
-            col += 1
-            if col >= 3:  # 3 cards per row
-                col = 0
-                row += 1
+            card = self.kpi_cards.get(kpi_name)
+            if card is None:
+                card = self.create_kpi_card(kpi_name)
+                row, col = divmod(len(self.kpi_cards), 3)  # 3 cards per row
+                self.kpi_grid.addWidget(card['box'], row, col)
+                self.kpi_cards[kpi_name] = card
+            self.update_kpi_card(card, kpi_data)
+        
+        # Hide cards for KPIs that are no longer reported
+        for kpi_name, card in self.kpi_cards.items():
+            card['box'].setVisible(kpi_name in kpis)
     
     def load_trends(self):
         """Load performance trends charts"""
         try:
             # Performance trends
-            fig = self.dashboard.plot_performance_trends()
-            html_file = os.path.join(self.temp_dir, 'trends.html')
-            fig.write_html(html_file)
-            self.trends_view.setUrl(QUrl.fromLocalFile(html_file))
+            self.show_figure(self.trends_view, 'plot_performance_trends')
             
             # Hourly demand heatmap
-            fig = self.dashboard.plot_hourly_heatmap()
-            html_file = os.path.join(self.temp_dir, 'demand.html')
-            fig.write_html(html_file)
-            self.demand_view.setUrl(QUrl.fromLocalFile(html_file))
+            self.show_figure(self.demand_view, 'plot_hourly_heatmap')
             
         except Exception as e:
             print(f"Error loading trends: {e}")
@@ -513,10 +731,7 @@ mathematical modeling, and human-centered system design.
     def load_strategy_analysis(self):
         """Load strategy comparison analysis"""
         try:
-            fig = self.dashboard.plot_strategy_comparison()
-            html_file = os.path.join(self.temp_dir, 'strategy.html')
-            fig.write_html(html_file)
-            self.strategy_view.setUrl(QUrl.fromLocalFile(html_file))
+            self.show_data('get_strategy_chart_data', self.update_strategy_charts)
             
         except Exception as e:
             print(f"Error loading strategy analysis: {e}")
@@ -546,10 +761,7 @@ mathematical modeling, and human-centered system design.
                 """)
             
             # Generate and load visualization
-            fig = self.dashboard.plot_littles_law_verification()
-            html_path = os.path.join(self.temp_dir, 'littles_law.html')
-            fig.write_html(html_path)
-            self.littles_view.load(QUrl.fromLocalFile(html_path))
+            self.show_figure(self.littles_view, 'plot_littles_law_verification')
             
         except Exception as e:
             self.littles_results_label.setText(f"❌ Error loading Little's Law analysis: {str(e)}")
@@ -592,10 +804,7 @@ mathematical modeling, and human-centered system design.
                 self.recommendations_layout.addWidget(rec_label)
             
             # Generate visualization
-            fig = self.dashboard.plot_wellbeing_analysis()
-            html_path = os.path.join(self.temp_dir, 'wellbeing.html')
-            fig.write_html(html_path)
-            self.wellbeing_view.load(QUrl.fromLocalFile(html_path))
+            self.show_figure(self.wellbeing_view, 'plot_wellbeing_analysis')
             
         except Exception as e:
             self.wellbeing_summary_label.setText(f"❌ Error loading wellbeing analysis: {str(e)}")
@@ -627,15 +836,8 @@ mathematical modeling, and human-centered system design.
             self.performance_summary_label.setText(summary_text)
             
             # Load additional charts
-            fig = self.dashboard.plot_utilization_vs_wait()
-            html_file = os.path.join(self.temp_dir, 'utilization.html')
-            fig.write_html(html_file)
-            self.util_view.setUrl(QUrl.fromLocalFile(html_file))
-            
-            fig = self.dashboard.plot_wait_time_histogram()
-            html_file = os.path.join(self.temp_dir, 'waittime.html')
-            fig.write_html(html_file)
-            self.wait_view.setUrl(QUrl.fromLocalFile(html_file))
+            self.show_figure(self.util_view, 'plot_utilization_vs_wait')
+            self.show_data('get_wait_time_histogram', self.update_wait_chart)
             
         except Exception as e:
             self.performance_summary_label.setText(f"❌ Error loading advanced insights: {str(e)}")
@@ -670,15 +872,9 @@ mathematical modeling, and human-centered system design.
     def closeEvent(self, event):
         """Clean up when window is closed"""
         if self.dashboard:
+            self.thread_pool.waitForDone()
             self.dashboard.close()
         
-        # Clean up temp files
-        import shutil
-        try:
-            shutil.rmtree(self.temp_dir)
-        except:
-            pass
-        
         super().closeEvent(event)
 
 
@@ -4,8 +4,17 @@ Handles SQLite database initialization and schema
 """
 
 import sqlite3
+from array import array
 from datetime import datetime
 import os
+import time
+
+# Compact codes for serviceType when customers are read back column-wise
+SERVICE_TYPE_CODES = {'standard_post': 0, 'passports': 1, 'parcels': 2}
+_SERVICE_TYPE_BYTE_CODES = {name.encode('ascii'): code for name, code in SERVICE_TYPE_CODES.items()}
+
+# Logged customers are held in memory and written in batches of this size
+CUSTOMER_BUFFER_SIZE = 1000
 
 class DatabaseManager:
     """Manages SQLite database for simulation logging"""
@@ -14,12 +23,31 @@ class DatabaseManager:
         """Initialize database connection and create tables if needed"""
         self.dbPath = dbPath
         os.makedirs(os.path.dirname(dbPath), exist_ok=True)
-        self.connection = sqlite3.connect(dbPath)
+        # Autocommit mode: multi-statement writes open their own transaction with BEGIN.
+        # Text comes back as bytes; the few text columns read are ASCII keys decoded where used
+        self.connection = sqlite3.connect(dbPath, detect_types=0, isolation_level=None)
+        self.connection.text_factory = bytes
         self.cursor = self.connection.cursor()
+        self._configureConnection()
         self._createTables()
+        self._resetCustomerBuffer()
+    
+    def _configureConnection(self):
+        """Tune SQLite for frequent small writes during a simulation run"""
+        # WAL appends commits to a log instead of syncing the main file every time,
+        # and synchronous=NORMAL is safe with WAL (only the last commits can be lost on power failure)
+        self.cursor.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA wal_autocheckpoint=1000;
+        ''')
     
     def _createTables(self):
         """Create database tables if they don't exist"""
+        self.cursor.execute('BEGIN')
         
         # Simulation runs table
         self.cursor.execute('''
@@ -27,8 +55,8 @@ class DatabaseManager:
                 runId INTEGER PRIMARY KEY AUTOINCREMENT,
                 dispatchStrategy TEXT NOT NULL,
                 timeAcceleration REAL NOT NULL,
-                startTime TIMESTAMP NOT NULL,
-                endTime TIMESTAMP,
+                startTime INTEGER NOT NULL,  -- time.time_ns()
+                endTime INTEGER,
                 serviceTimeStandardPost REAL,
                 serviceTimePassports REAL,
                 serviceTimeParcels REAL,
@@ -37,10 +65,18 @@ class DatabaseManager:
             )
         ''')
         
-        # Customers table
+        # Customers table; the simulator numbers customers from 1 again every run,
+        # so a customer is identified by (runId, customerId)
+        unscopedCustomers = self._customersKeyedByIdOnly()
+        if unscopedCustomers:
+            # Older databases keyed customers on customerId alone; move them aside and
+            # copy them into the new table below (legacy rename leaves other tables' SQL alone)
+            self.cursor.execute('PRAGMA legacy_alter_table=ON')
+            self.cursor.execute('ALTER TABLE customers RENAME TO customersUnscoped')
+            self.cursor.execute('PRAGMA legacy_alter_table=OFF')
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS customers (
-                customerId INTEGER PRIMARY KEY AUTOINCREMENT,
+                customerId INTEGER NOT NULL,
                 runId INTEGER NOT NULL,
                 serviceType TEXT NOT NULL,
                 arrivalTime REAL NOT NULL,
@@ -52,9 +88,22 @@ class DatabaseManager:
                 outcome TEXT NOT NULL,
                 serverId INTEGER,
                 boothId INTEGER,
+                PRIMARY KEY (runId, customerId),
                 FOREIGN KEY (runId) REFERENCES simulationRuns(runId)
             )
         ''')
+        if unscopedCustomers:
+            self.cursor.execute('''
+                INSERT INTO customers
+                (customerId, runId, serviceType, arrivalTime, queueJoinTime,
+                 serviceStartTime, serviceEndTime, waitDuration, serviceDuration,
+                 outcome, serverId, boothId)
+                SELECT customerId, runId, serviceType, arrivalTime, queueJoinTime,
+                       serviceStartTime, serviceEndTime, waitDuration, serviceDuration,
+                       outcome, serverId, boothId
+                FROM customersUnscoped
+            ''')
+            self.cursor.execute('DROP TABLE customersUnscoped')
         
         # Server events table
         self.cursor.execute('''
@@ -68,7 +117,7 @@ class DatabaseManager:
                 customerId INTEGER,
                 serviceType TEXT,
                 FOREIGN KEY (runId) REFERENCES simulationRuns(runId),
-                FOREIGN KEY (customerId) REFERENCES customers(customerId)
+                FOREIGN KEY (runId, customerId) REFERENCES customers(runId, customerId)
             )
         ''')
         
@@ -84,8 +133,43 @@ class DatabaseManager:
             )
         ''')
         
+        # Per-run summary, filled when a run ends so statistics don't rescan customers
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runSummary (
+                runId INTEGER NOT NULL,
+                serviceType TEXT NOT NULL,
+                avgWait REAL,
+                totalCustomers INTEGER NOT NULL,
+                completed INTEGER NOT NULL,
+                abandoned INTEGER NOT NULL,
+                avgService REAL,
+                PRIMARY KEY (runId, serviceType),
+                FOREIGN KEY (runId) REFERENCES simulationRuns(runId)
+            )
+        ''')
+        
+        # Indexes for per-run lookups and aggregates
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_customers_run_svc
+            ON customers(runId, serviceType, outcome)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_run
+            ON serverEvents(runId, serverId)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_snapshots_run_time
+            ON queueSnapshots(runId, snapshotTime)
+        ''')
+        
         self.connection.commit()
     
+    def _customersKeyedByIdOnly(self):
+        """Check whether an existing customers table uses the old customerId-only key"""
+        primaryKey = [column[1] for column in self.cursor.execute('PRAGMA table_info(customers)')
+                      if column[5]]
+        return primaryKey in ([b'customerId'], ['customerId'])
+    
     def startSimulationRun(self, dispatchStrategy, timeAcceleration, serviceTimes, abandonmentEnabled):
         """Create a new simulation run and return its ID"""
         self.cursor.execute('''
@@ -97,7 +181,7 @@ class DatabaseManager:
         ''', (
             dispatchStrategy,
             timeAcceleration,
-            datetime.now(),
+            time.time_ns(),
             serviceTimes.get('standard_post', 2.0),
             serviceTimes.get('passports', 5.0),
             serviceTimes.get('parcels', 3.0),
@@ -108,27 +192,117 @@ class DatabaseManager:
     
     def endSimulationRun(self, runId):
         """Mark simulation run as ended"""
-        self.cursor.execute('''
-            UPDATE simulationRuns 
-            SET endTime = ? 
-            WHERE runId = ?
-        ''', (datetime.now(), runId))
+        self.flushCustomers()
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.execute('''
+                UPDATE simulationRuns 
+                SET endTime = ? 
+                WHERE runId = ?
+            ''', (time.time_ns(), runId))
+            self.cursor.execute('''
+                INSERT OR REPLACE INTO runSummary
+                (runId, serviceType, avgWait, totalCustomers, completed, abandoned, avgService)
+                SELECT runId, serviceType,
+                       AVG(waitDuration),
+                       COUNT(*),
+                       SUM(outcome = 'completed'),
+                       SUM(outcome = 'abandoned'),
+                       AVG(serviceDuration)
+                FROM customers
+                WHERE runId = ?
+                GROUP BY serviceType
+            ''', (runId,))
+        except Exception:
+            self.connection.rollback()
+            raise
         self.connection.commit()
+        self.analyze()
+    
+    def analyze(self):
+        """Refresh query planner statistics after a bulk of writes"""
+        self.cursor.execute('ANALYZE')
+        self.connection.commit()
+    
+    def _resetCustomerBuffer(self):
+        """Start an empty column-wise buffer of customers waiting to be written"""
+        # One typed array per numeric column (NaN / -1 stand in for NULL) rather than a
+        # 12-item tuple per customer; the text columns only hold references to shared strings
+        self._customerBuffer = {
+            'customerId': array('q'),
+            'runId': array('q'),
+            'serviceType': [],
+            'arrivalTime': array('d'),
+            'queueJoinTime': array('d'),
+            'serviceStartTime': array('d'),
+            'serviceEndTime': array('d'),
+            'waitDuration': array('d'),
+            'serviceDuration': array('d'),
+            'outcome': [],
+            'serverId': array('q'),
+            'boothId': array('q')
+        }
+        self._bufferedCustomers = 0
     
     def logCustomer(self, runId, customerId, serviceType, arrivalTime, queueJoinTime, 
                     serviceStartTime, serviceEndTime, waitDuration, serviceDuration, 
                     outcome, serverId, boothId):
-        """Log a customer's complete journey"""
-        self.cursor.execute('''
-            INSERT INTO customers 
-            (customerId, runId, serviceType, arrivalTime, queueJoinTime, 
-             serviceStartTime, serviceEndTime, waitDuration, serviceDuration, 
-             outcome, serverId, boothId)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (customerId, runId, serviceType, arrivalTime, queueJoinTime,
-              serviceStartTime, serviceEndTime, waitDuration, serviceDuration,
-              outcome, serverId, boothId))
+        """Log a customer's complete journey (buffered until flushCustomers)"""
+        nan = float('nan')
+        buf = self._customerBuffer
+        buf['customerId'].append(customerId)
+        buf['runId'].append(runId)
+        buf['serviceType'].append(serviceType)
+        buf['arrivalTime'].append(arrivalTime)
+        buf['queueJoinTime'].append(queueJoinTime)
+        buf['serviceStartTime'].append(nan if serviceStartTime is None else serviceStartTime)
+        buf['serviceEndTime'].append(nan if serviceEndTime is None else serviceEndTime)
+        buf['waitDuration'].append(nan if waitDuration is None else waitDuration)
+        buf['serviceDuration'].append(nan if serviceDuration is None else serviceDuration)
+        buf['outcome'].append(outcome)
+        buf['serverId'].append(-1 if serverId is None else serverId)
+        buf['boothId'].append(-1 if boothId is None else boothId)
+        
+        self._bufferedCustomers += 1
+        if self._bufferedCustomers >= CUSTOMER_BUFFER_SIZE:
+            self.flushCustomers()
+    
+    def flushCustomers(self):
+        """Write any buffered customers to the database"""
+        if not self._bufferedCustomers:
+            return
+        
+        buf = self._customerBuffer
+        
+        def rows():
+            # Turn the NULL sentinels back into None as each row is bound
+            for (customerId, runId, serviceType, arrivalTime, queueJoinTime,
+                 serviceStartTime, serviceEndTime, waitDuration, serviceDuration,
+                 outcome, serverId, boothId) in zip(*buf.values()):
+                yield (customerId, runId, serviceType, arrivalTime, queueJoinTime,
+                       None if serviceStartTime != serviceStartTime else serviceStartTime,
+                       None if serviceEndTime != serviceEndTime else serviceEndTime,
+                       None if waitDuration != waitDuration else waitDuration,
+                       None if serviceDuration != serviceDuration else serviceDuration,
+                       outcome,
+                       None if serverId < 0 else serverId,
+                       None if boothId < 0 else boothId)
+        
+        # A failed batch is rolled back and stays buffered, so the next flush retries it
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.executemany('''
+                INSERT INTO customers 
+                (customerId, runId, serviceType, arrivalTime, queueJoinTime, 
+                 serviceStartTime, serviceEndTime, waitDuration, serviceDuration, 
+                 outcome, serverId, boothId)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows())
+        except Exception:
+            self.connection.rollback()
+            raise
         self.connection.commit()
+        self._resetCustomerBuffer()
     
     def logServerEvent(self, runId, serverId, eventType, eventTime, boothId=None, 
                        customerId=None, serviceType=None):
@@ -142,41 +316,109 @@ class DatabaseManager:
     
     def logQueueSnapshot(self, runId, snapshotTime, queueLengths):
         """Log queue lengths at a point in time"""
-        for serviceType, length in queueLengths.items():
-            self.cursor.execute('''
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.executemany('''
                 INSERT INTO queueSnapshots 
                 (runId, snapshotTime, serviceType, queueLength)
                 VALUES (?, ?, ?, ?)
-            ''', (runId, snapshotTime, serviceType, length))
+            ''', [(runId, snapshotTime, serviceType, length)
+                  for serviceType, length in queueLengths.items()])
+        except Exception:
+            self.connection.rollback()
+            raise
         self.connection.commit()
     
     def getRunStatistics(self, runId):
         """Get statistics for a simulation run"""
+        self.flushCustomers()
         stats = {}
         
-        # Average wait time by service type
+        # Finished runs are served from runSummary
         self.cursor.execute('''
-            SELECT serviceType, 
-                   AVG(waitDuration) as avgWait,
-                   COUNT(*) as totalCustomers,
-                   SUM(CASE WHEN outcome = 'completed' THEN 1 ELSE 0 END) as completed,
-                   SUM(CASE WHEN outcome = 'abandoned' THEN 1 ELSE 0 END) as abandoned
-            FROM customers
+            SELECT serviceType, avgWait, totalCustomers, completed, abandoned, avgService
+            FROM runSummary
             WHERE runId = ?
-            GROUP BY serviceType
         ''', (runId,))
+        rows = self.cursor.fetchall()
+        
+        if not rows:
+            # Run still in progress: aggregate the customers logged so far
+            self.cursor.execute('''
+                SELECT serviceType, 
+                       AVG(waitDuration) as avgWait,
+                       COUNT(*) as totalCustomers,
+                       SUM(CASE WHEN outcome = 'completed' THEN 1 ELSE 0 END) as completed,
+                       SUM(CASE WHEN outcome = 'abandoned' THEN 1 ELSE 0 END) as abandoned,
+                       AVG(serviceDuration) as avgService
+                FROM customers
+                WHERE runId = ?
+                GROUP BY serviceType
+            ''', (runId,))
+            rows = self.cursor.fetchall()
         
         stats['byServiceType'] = {}
-        for row in self.cursor.fetchall():
-            stats['byServiceType'][row[0]] = {
+        for row in rows:
+            stats['byServiceType'][row[0].decode('ascii')] = {
                 'avgWait': row[1],
                 'totalCustomers': row[2],
                 'completed': row[3],
-                'abandoned': row[4]
+                'abandoned': row[4],
+                'avgService': row[5]
             }
         
         return stats
     
+    def getRunTimes(self, runId):
+        """Get a run's start and end as datetimes (end is None while running)"""
+        self.cursor.execute('''
+            SELECT startTime, endTime FROM simulationRuns WHERE runId = ?
+        ''', (runId,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None, None
+        return tuple(self._toDatetime(value) for value in row)
+    
+    @staticmethod
+    def _toDatetime(value):
+        """Convert a stored run timestamp to a datetime"""
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            # Runs logged before timestamps were stored as nanoseconds
+            return datetime.fromisoformat(value.decode('ascii'))
+        return datetime.fromtimestamp(value / 1e9)
+    
+    def getCustomerColumns(self, runId, batchSize=65536):
+        """Get a run's customers as (waitDuration, arrivalTime, serviceType) typed columns"""
+        # Streams rows in batches into flat arrays instead of materialising a tuple per customer;
+        # a NULL wait becomes NaN and serviceType is stored as its SERVICE_TYPE_CODES value
+        self.flushCustomers()
+        waits = array('d')
+        arrivals = array('d')
+        serviceTypes = array('B')
+        nan = float('nan')
+        cursor = self.connection.execute('''
+            SELECT waitDuration, arrivalTime, serviceType
+            FROM customers
+            WHERE runId = ?
+        ''', (runId,))
+        
+        rows = cursor.fetchmany(batchSize)
+        while rows:
+            for wait, arrival, serviceType in rows:
+                waits.append(nan if wait is None else wait)
+                arrivals.append(arrival)
+                serviceTypes.append(_SERVICE_TYPE_BYTE_CODES.get(serviceType, 255))
+            rows = cursor.fetchmany(batchSize)
+        
+        return {
+            'waitDuration': waits,
+            'arrivalTime': arrivals,
+            'serviceType': serviceTypes
+        }
+    
     def close(self):
         """Close database connection"""
+        self.flushCustomers()
         self.connection.close()
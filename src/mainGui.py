@@ -4,35 +4,190 @@ PyQt5-based interface with real-time visualization
 """
 
 import sys
-import os
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import deque
+from functools import lru_cache
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QLabel, QPushButton, QGroupBox,
                               QGridLayout, QComboBox, QSpinBox, QDoubleSpinBox,
                               QCheckBox, QStatusBar, QFrame, QScrollArea)
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QObject
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QObject, QThread
 from PyQt5.QtGui import QFont, QPalette, QColor
 
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 from queueSimulator import QueueSimulator, DispatchStrategy
 from microbitComms import MicrobitCommunicator
 from database import DatabaseManager
 
 
+STATS_INTERVAL_MS = 100  # Statistics and analytics labels redraw at 10 Hz
+HOURS_PER_MINUTE = 1.0 / 60.0
+
+# Display names for the fixed set of service types
+SERVICE_DISPLAY_NAME = {
+    'standard_post': 'Standard Post',
+    'passports': 'Passports',
+    'parcels': 'Parcels',
+    None: 'Unknown'
+}
+
+# Booth/server styling, shared by every widget instead of rebuilt per update
+BUSY_FRAME_COLORS = ("#FF6347", "#CC0000")  # (background, border)
+IDLE_FRAME_COLORS = ("#90EE90", "#228B22")
+BUSY_TEXT_STYLE = "color: #CC0000;"
+IDLE_TEXT_STYLE = "color: #228B22;"
+BUSY_STATUS_STYLE = "color: #CC0000; font-weight: bold;"
+IDLE_STATUS_STYLE = "color: #228B22; font-weight: bold;"
+BOOTH_SERVING_STATUS_STYLE = "color: white; font-weight: bold;"
+BOOTH_SERVING_INFO_STYLE = "color: white;"
+
+# Label text templates, filled with % so each label's values can be compared before formatting
+SIM_TIME_TEXT = "Simulation Time: %.1f min"
+STATS_TEXT = "Total Customers: %d<br>Served: %d<br>Abandoned: %d<br>Avg Wait: %.1f min"
+SERVICE_STATS_TEXT = "<br><br>".join(  # One block per service type
+    ["%s:<br>&nbsp;&nbsp;Waiting: %d | Served: %d | Avg Wait: %.1f min"] * 3)
+SERVER_UTIL_TEXT = "Busy Servers: %d / %d (%.0f%%)"
+BOOTH_UTIL_TEXT = "Occupied Booths: %d / %d (%.0f%%)"
+THROUGHPUT_TEXT = "Throughput: %.1f customers/hour"
+ABANDONMENT_RATE_TEXT = "Abandonment Rate: %.1f%%"
+RUN_ID_TEXT = "Current Run ID: %d"
+
+
+@lru_cache(maxsize=None)
+def sharedFont(pointSize, bold=False, family=None):
+    """Get a font (default family unless given), built once per family/size/weight and shared by all widgets"""
+    # Created on first use rather than at import, since fonts need the QApplication
+    font = QFont(family) if family else QFont()
+    font.setPointSize(pointSize)
+    font.setBold(bold)
+    return font
+
+
+@lru_cache(maxsize=None)
+def framePalette(background, border=None):
+    """Get a palette that fills a frame with background (and draws a plain frame in border)"""
+    # Palette colours are applied directly, unlike stylesheets which go through style recalculation
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(background))
+    if border:
+        palette.setColor(QPalette.WindowText, QColor(border))
+    return palette
+
+
 class SimulationSignals(QObject):
     """Signals for thread-safe GUI updates"""
-    customerAdded = pyqtSignal(str)
+    customersPending = pyqtSignal()  # Micro:bit requests are waiting in pendingCustomers
     stateUpdated = pyqtSignal()
 
 
+def takeSnapshot(simulator):
+    """Copy the simulator state shown by the GUI (caller holds the simulator lock)"""
+    queueLengths = simulator.getQueueLengths()
+    stats = simulator.getStatistics()
+    return {
+        'queueLengths': queueLengths,
+        'serverColumns': simulator.getServerColumns(),
+        'boothColumns': simulator.getBoothColumns(),
+        'stats': stats,
+        'analytics': analyticsValues(queueLengths, stats, simulator.serviceServedCount,
+                                     simulator.serviceWaitSum)
+    }
+
+
+def analyticsValues(queueLengths, stats, servedCounts, waitSums):
+    """Work out the values for each statistics label template, rounded as displayed"""
+    # Done while snapshotting (normally on the simulation thread) so the GUI only formats
+    serviceValues = []
+    for serviceType in ('standard_post', 'passports', 'parcels'):
+        served = servedCounts[serviceType]
+        avgWait = waitSums[serviceType] / served if served > 0 else 0
+        serviceValues += (SERVICE_DISPLAY_NAME[serviceType], queueLengths[serviceType],
+                          served, round(avgWait, 1))
+    
+    # Throughput in customers per hour
+    simTimeHours = stats['simulationTime'] * HOURS_PER_MINUTE
+    throughput = stats['totalServed'] / simTimeHours if simTimeHours > 0 else 0
+    
+    abandonmentRate = 0
+    if stats['totalCustomers'] > 0:
+        abandonmentRate = stats['totalAbandoned'] * 100.0 / stats['totalCustomers']
+    
+    # Server and booth counts are fixed by the configuration, so they never need a zero guard
+    busyServers, serverCount = stats['busyServers'], stats['serverCount']
+    occupiedBooths, boothCount = stats['occupiedBooths'], stats['boothCount']
+    return {
+        'stats': (stats['totalCustomers'], stats['totalServed'], stats['totalAbandoned'],
+                  round(stats['avgWaitTime'], 1)),
+        'serviceStats': tuple(serviceValues),
+        'serverUtil': (busyServers, serverCount, round(busyServers * 100.0 / serverCount)),
+        'boothUtil': (occupiedBooths, boothCount, round(occupiedBooths * 100.0 / boothCount)),
+        'throughput': (round(throughput, 1),),
+        'abandonmentRate': (round(abandonmentRate, 1),)
+    }
+
+
+class SimulationWorker(QObject):
+    """Steps the simulator on a background thread and publishes display snapshots"""
+    snapshotReady = pyqtSignal(object)
+    timeAdvanced = pyqtSignal(float)
+    
+    def __init__(self, simulator, lock, interval=100):
+        super().__init__()
+        self.simulator = simulator
+        self.lock = lock
+        self.interval = interval
+    
+    def start(self):
+        """Start stepping (runs in the worker thread, so the timers fire there too)"""
+        self.step()
+    
+    def step(self):
+        """Advance the simulation, send the GUI whatever changed and schedule the next step"""
+        stepStart = time.monotonic()
+        
+        with self.lock:
+            running = self.simulator.running
+            if running:
+                self.simulator.update()
+                if self.simulator.dirty:
+                    snapshot = takeSnapshot(self.simulator)
+                    self.simulator.dirty = False
+                else:
+                    snapshot = None
+                    simulationTime = self.simulator.simulationTime
+        
+        if running:
+            if snapshot is not None:
+                self.snapshotReady.emit(snapshot)
+            else:
+                # Nothing visible changed except the clock
+                self.timeAdvanced.emit(simulationTime)
+        
+        # Chain single shots rather than a repeating timer so slow steps never queue up
+        elapsedMs = int((time.monotonic() - stepStart) * 1000)
+        QTimer.singleShot(max(0, self.interval - elapsedMs), self.step)
+
+
 class QueueVisualization(QWidget):
     """Widget to visualize a single queue"""
     
+    # Frame colour per queue length bucket: empty, <5, <10, 10+
+    COLORS = (
+        "#90EE90",  # Light green
+        "#FFD700",  # Gold
+        "#FFA500",  # Orange
+        "#FF6347"   # Tomato red
+    )
+    
     def __init__(self, serviceType, parent=None):
         super().__init__(parent)
         self.serviceType = serviceType
         self.queueLength = 0
+        self.lastBucket = -1
+        self.lastLength = -1
         self.initUI()
     
     def initUI(self):
@@ -40,21 +195,15 @@ class QueueVisualization(QWidget):
         layout = QVBoxLayout()
         
         # Service type label
-        titleFont = QFont()
-        titleFont.setPointSize(12)
-        titleFont.setBold(True)
-        
-        self.titleLabel = QLabel(self.serviceType.replace('_', ' ').title())
-        self.titleLabel.setFont(titleFont)
+        self.titleLabel = QLabel(SERVICE_DISPLAY_NAME.get(self.serviceType, 'Unknown'))
+        self.titleLabel.setFont(sharedFont(12, bold=True))
         self.titleLabel.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.titleLabel)
         
         # Queue length display
         self.lengthLabel = QLabel("Queue: 0")
         self.lengthLabel.setAlignment(Qt.AlignCenter)
-        queueFont = QFont()
-        queueFont.setPointSize(24)
-        self.lengthLabel.setFont(queueFont)
+        self.lengthLabel.setFont(sharedFont(24))
         layout.addWidget(self.lengthLabel)
         
         # Visual queue representation
@@ -62,6 +211,7 @@ class QueueVisualization(QWidget):
         self.queueFrame.setMinimumHeight(200)
         self.queueFrame.setFrameStyle(QFrame.Box | QFrame.Sunken)
         self.queueFrame.setLineWidth(2)
+        self.queueFrame.setAutoFillBackground(True)
         layout.addWidget(self.queueFrame)
         
         self.setLayout(layout)
@@ -69,19 +219,24 @@ class QueueVisualization(QWidget):
     def updateQueue(self, length):
         """Update queue visualization"""
         self.queueLength = length
-        self.lengthLabel.setText(f"Queue: {length}")
         
         # Color coding based on queue length
         if length == 0:
-            color = "#90EE90"  # Light green
+            bucket = 0
         elif length < 5:
-            color = "#FFD700"  # Gold
+            bucket = 1
         elif length < 10:
-            color = "#FFA500"  # Orange
+            bucket = 2
         else:
-            color = "#FF6347"  # Tomato red
-        
-        self.queueFrame.setStyleSheet(f"background-color: {color};")
+            bucket = 3
+        
+        # Restyling forces a Qt style recomputation, so only touch what changed
+        if length != self.lastLength:
+            self.lastLength = length
+            self.lengthLabel.setText(f"Queue: {length}")
+        if bucket != self.lastBucket:
+            self.lastBucket = bucket
+            self.queueFrame.setPalette(framePalette(self.COLORS[bucket]))
 
 
 class BoothDisplay(QWidget):
@@ -90,6 +245,8 @@ class BoothDisplay(QWidget):
     def __init__(self, boothId, parent=None):
         super().__init__(parent)
         self.boothId = boothId
+        self.lastKey = None
+        self.lastOccupied = None
         self.initUI()
     
     def initUI(self):
@@ -101,17 +258,12 @@ class BoothDisplay(QWidget):
         # Booth number with icon
         titleLayout = QHBoxLayout()
         self.iconLabel = QLabel("🏢")
-        iconFont = QFont()
-        iconFont.setPointSize(14)
-        self.iconLabel.setFont(iconFont)
+        self.iconLabel.setFont(sharedFont(14))
         titleLayout.addWidget(self.iconLabel)
         
         self.titleLabel = QLabel(f"Booth {self.boothId + 1}")
         self.titleLabel.setAlignment(Qt.AlignCenter)
-        titleFont = QFont()
-        titleFont.setBold(True)
-        titleFont.setPointSize(10)
-        self.titleLabel.setFont(titleFont)
+        self.titleLabel.setFont(sharedFont(10, bold=True))
         titleLayout.addWidget(self.titleLabel)
         titleLayout.addStretch()
         layout.addLayout(titleLayout)
@@ -120,8 +272,9 @@ class BoothDisplay(QWidget):
         self.statusFrame = QFrame()
         self.statusFrame.setMinimumSize(120, 80)
         self.statusFrame.setMaximumSize(160, 100)
-        self.statusFrame.setFrameStyle(QFrame.Box | QFrame.Raised)
+        self.statusFrame.setFrameStyle(QFrame.Box | QFrame.Plain)  # Plain boxes are drawn in WindowText
         self.statusFrame.setLineWidth(2)
+        self.statusFrame.setAutoFillBackground(True)
         
         # Status content
         statusLayout = QVBoxLayout()
@@ -131,27 +284,20 @@ class BoothDisplay(QWidget):
         # Staff indicator
         self.serverLabel = QLabel("👤")
         self.serverLabel.setAlignment(Qt.AlignCenter)
-        serverFont = QFont()
-        serverFont.setPointSize(16)
-        self.serverLabel.setFont(serverFont)
+        self.serverLabel.setFont(sharedFont(16))
         statusLayout.addWidget(self.serverLabel)
         
         # Status text
         self.statusLabel = QLabel("IDLE")
         self.statusLabel.setAlignment(Qt.AlignCenter)
-        statusFont = QFont()
-        statusFont.setPointSize(9)
-        statusFont.setBold(True)
-        self.statusLabel.setFont(statusFont)
+        self.statusLabel.setFont(sharedFont(9, bold=True))
         statusLayout.addWidget(self.statusLabel)
         
         # Service info
         self.serviceLabel = QLabel("")
         self.serviceLabel.setAlignment(Qt.AlignCenter)
         self.serviceLabel.setWordWrap(True)
-        infoFont = QFont()
-        infoFont.setPointSize(8)
-        self.serviceLabel.setFont(infoFont)
+        self.serviceLabel.setFont(sharedFont(8))
         statusLayout.addWidget(self.serviceLabel)
         
         self.statusFrame.setLayout(statusLayout)
@@ -162,25 +308,34 @@ class BoothDisplay(QWidget):
     
     def updateStatus(self, occupied, serverId, serviceType, timeRemaining):
         """Update booth status"""
+        key = (occupied, serverId, serviceType, round(timeRemaining, 1))
+        if key == self.lastKey:
+            return
+        self.lastKey = key
+        
+        # Stylesheets only change when the booth flips between serving and available
+        if occupied != self.lastOccupied:
+            self.lastOccupied = occupied
+            if occupied:
+                self.statusFrame.setPalette(framePalette(*BUSY_FRAME_COLORS))
+                self.serverLabel.setText("👷")
+                self.statusLabel.setText("SERVING")
+                self.statusLabel.setStyleSheet(BOOTH_SERVING_STATUS_STYLE)
+                self.serviceLabel.setStyleSheet(BOOTH_SERVING_INFO_STYLE)
+                self.titleLabel.setStyleSheet(BUSY_TEXT_STYLE)
+            else:
+                self.statusFrame.setPalette(framePalette(*IDLE_FRAME_COLORS))
+                self.serverLabel.setText("🪑")
+                self.statusLabel.setText("AVAILABLE")
+                self.statusLabel.setStyleSheet(IDLE_STATUS_STYLE)
+                self.serviceLabel.setText("Ready")
+                self.serviceLabel.setStyleSheet(IDLE_TEXT_STYLE)
+                self.titleLabel.setStyleSheet(IDLE_TEXT_STYLE)
+        
         if occupied:
-            self.statusFrame.setStyleSheet("background-color: #FF6347; border: 2px solid #CC0000;")
-            self.serverLabel.setText("👷")
-            self.statusLabel.setText("SERVING")
-            self.statusLabel.setStyleSheet("color: white; font-weight: bold;")
-            
             serverText = f"Server {serverId + 1}" if serverId is not None else "Server ?"
-            serviceText = serviceType.replace('_', ' ').title() if serviceType else "Unknown"
+            serviceText = SERVICE_DISPLAY_NAME.get(serviceType, 'Unknown')
             self.serviceLabel.setText(f"{serverText}\n{serviceText}\n⏱ {timeRemaining:.1f}min")
-            self.serviceLabel.setStyleSheet("color: white;")
-            self.titleLabel.setStyleSheet("color: #CC0000;")
-        else:
-            self.statusFrame.setStyleSheet("background-color: #90EE90; border: 2px solid #228B22;")
-            self.serverLabel.setText("🪑")
-            self.statusLabel.setText("AVAILABLE")
-            self.statusLabel.setStyleSheet("color: #228B22; font-weight: bold;")
-            self.serviceLabel.setText("Ready")
-            self.serviceLabel.setStyleSheet("color: #228B22;")
-            self.titleLabel.setStyleSheet("color: #228B22;")
 
 
 class ServerDisplay(QWidget):
@@ -189,6 +344,7 @@ class ServerDisplay(QWidget):
     def __init__(self, serverId, parent=None):
         super().__init__(parent)
         self.serverId = serverId
+        self.lastKey = None
         self.initUI()
     
     def initUI(self):
@@ -200,35 +356,29 @@ class ServerDisplay(QWidget):
         # Server icon (person emoji/symbol)
         self.iconLabel = QLabel("👤")
         self.iconLabel.setAlignment(Qt.AlignCenter)
-        iconFont = QFont()
-        iconFont.setPointSize(18)
-        self.iconLabel.setFont(iconFont)
+        self.iconLabel.setFont(sharedFont(18))
         layout.addWidget(self.iconLabel)
         
         # Server number
         self.idLabel = QLabel(f"Server {self.serverId + 1}")
         self.idLabel.setAlignment(Qt.AlignCenter)
-        idFont = QFont()
-        idFont.setBold(True)
-        idFont.setPointSize(9)
-        self.idLabel.setFont(idFont)
+        self.idLabel.setFont(sharedFont(9, bold=True))
         layout.addWidget(self.idLabel)
         
         # Status frame with color - SMALLER
         self.statusFrame = QFrame()
         self.statusFrame.setMinimumSize(70, 40)
         self.statusFrame.setMaximumSize(100, 50)
-        self.statusFrame.setFrameStyle(QFrame.Box | QFrame.Raised)
+        self.statusFrame.setFrameStyle(QFrame.Box | QFrame.Plain)  # Plain boxes are drawn in WindowText
         self.statusFrame.setLineWidth(2)
+        self.statusFrame.setAutoFillBackground(True)
         layout.addWidget(self.statusFrame)
         
         # Status text
         self.statusLabel = QLabel("SPARE")
         self.statusLabel.setAlignment(Qt.AlignCenter)
         self.statusLabel.setWordWrap(True)
-        statusFont = QFont()
-        statusFont.setPointSize(7)
-        self.statusLabel.setFont(statusFont)
+        self.statusLabel.setFont(sharedFont(7))
         layout.addWidget(self.statusLabel)
         
         self.setLayout(layout)
@@ -237,21 +387,25 @@ class ServerDisplay(QWidget):
     
     def updateStatus(self, state, boothId, serviceType):
         """Update server status"""
+        key = (state, boothId, serviceType)
+        if key == self.lastKey:
+            return
+        self.lastKey = key
+        
         if state == "busy":
             self.iconLabel.setText("👷")
-            self.statusFrame.setStyleSheet("background-color: #FF6347; border: 2px solid #CC0000;")
-            self.idLabel.setStyleSheet("color: #CC0000;")
+            self.statusFrame.setPalette(framePalette(*BUSY_FRAME_COLORS))
+            self.idLabel.setStyleSheet(BUSY_TEXT_STYLE)
             
             boothText = f"Booth {boothId + 1}" if boothId is not None else "?"
-            serviceText = serviceType.replace('_', ' ').title() if serviceType else ""
             self.statusLabel.setText(f"BUSY\n{boothText}")
-            self.statusLabel.setStyleSheet("color: #CC0000; font-weight: bold;")
+            self.statusLabel.setStyleSheet(BUSY_STATUS_STYLE)
         else:
             self.iconLabel.setText("👤")
-            self.statusFrame.setStyleSheet("background-color: #90EE90; border: 2px solid #228B22;")
-            self.idLabel.setStyleSheet("color: #228B22;")
+            self.statusFrame.setPalette(framePalette(*IDLE_FRAME_COLORS))
+            self.idLabel.setStyleSheet(IDLE_TEXT_STYLE)
             self.statusLabel.setText("AVAILABLE")
-            self.statusLabel.setStyleSheet("color: #228B22; font-weight: bold;")
+            self.statusLabel.setStyleSheet(IDLE_STATUS_STYLE)
 
 
 class MainWindow(QMainWindow):
@@ -261,17 +415,42 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.simulator = None
         self.microbit = None
-        self.database = None
+        self.database = None  # Created and used only on the database thread
         self.currentRunId = None
+        self.dbQueue = queue.Queue(maxsize=1000)  # Database tasks for the database thread
+        self.dbThread = None
+        self.simulatorLock = threading.Lock()  # Guards the simulator shared with the worker thread
         self.signals = SimulationSignals()
+        self.labelValues = {}  # Last values formatted into each statistics label
+        self.strategyMap = {
+            0: DispatchStrategy.LONGEST_WAIT_FIRST,
+            1: DispatchStrategy.SHORTEST_JOB_FIRST,
+            2: DispatchStrategy.ROUND_ROBIN,
+            3: DispatchStrategy.PRIORITY_ORDER
+        }
+        
+        # Statistics labels and the analytics tab redraw from the latest snapshot on a
+        # fixed timer rather than on every simulation tick
+        self.lastAnalyticsKey = None
+        self.pendingAnalytics = None
+        self.analyticsTimer = QTimer(self)
+        self.analyticsTimer.timeout.connect(self.flushAnalytics)
+        self.analyticsTimer.start(STATS_INTERVAL_MS)
+        
+        # Micro:bit requests queue here and the GUI thread drains them after one wake
+        # signal, rather than every button press posting its own event
+        self.pendingCustomers = deque()
+        self.customerWakePending = False
         
         # Connect signals
-        self.signals.customerAdded.connect(self.addCustomer)
+        self.signals.customersPending.connect(self.addPendingCustomers)
         
         self.initUI()
         self.initSimulator()
+        self.connectConfigControls()
         self.initMicrobit()
-        self.setupTimer()
+        self.updateDisplay()  # Fill the statistics labels with the initial state
+        self.setupWorker()
     
     def initUI(self):
         """Initialize user interface"""
@@ -305,10 +484,7 @@ class MainWindow(QMainWindow):
         
         # Title
         titleLabel = QLabel("Post Office Queue Simulation")
-        titleFont = QFont()
-        titleFont.setPointSize(16)
-        titleFont.setBold(True)
-        titleLabel.setFont(titleFont)
+        titleLabel.setFont(sharedFont(16, bold=True))
         titleLabel.setAlignment(Qt.AlignCenter)
         layout.addWidget(titleLabel)
         
@@ -352,7 +528,7 @@ class MainWindow(QMainWindow):
         # Visual separator with arrow
         arrowLabel = QLabel("▲ Customers Called Up ▲")
         arrowLabel.setAlignment(Qt.AlignCenter)
-        arrowLabel.setFont(QFont("Arial", 10, QFont.Bold))
+        arrowLabel.setFont(sharedFont(10, True, 'Arial'))
         arrowLabel.setStyleSheet("color: #2196F3; padding: 5px;")
         layout.addWidget(arrowLabel)
         
@@ -469,17 +645,10 @@ class MainWindow(QMainWindow):
         self.simTimeLabel = QLabel("Simulation Time: 0.0 min")
         statsLayout.addWidget(self.simTimeLabel)
         
-        self.totalCustomersLabel = QLabel("Total Customers: 0")
-        statsLayout.addWidget(self.totalCustomersLabel)
-        
-        self.servedLabel = QLabel("Served: 0")
-        statsLayout.addWidget(self.servedLabel)
-        
-        self.abandonedLabel = QLabel("Abandoned: 0")
-        statsLayout.addWidget(self.abandonedLabel)
-        
-        self.avgWaitLabel = QLabel("Avg Wait: 0.0 min")
-        statsLayout.addWidget(self.avgWaitLabel)
+        # Remaining counters share one rich-text label so an update is a single setText
+        self.statsLabel = QLabel()
+        self.statsLabel.setTextFormat(Qt.RichText)
+        statsLayout.addWidget(self.statsLabel)
         
         statsGroup.setLayout(statsLayout)
         controlLayout.addWidget(statsGroup)
@@ -527,7 +696,7 @@ class MainWindow(QMainWindow):
         
         # Analytics title
         analyticsTitle = QLabel("Current Run Analytics")
-        analyticsTitle.setFont(QFont("Arial", 12, QFont.Bold))
+        analyticsTitle.setFont(sharedFont(12, True, 'Arial'))
         analyticsLayout.addWidget(analyticsTitle)
         
         # By Service Type section
@@ -535,17 +704,10 @@ class MainWindow(QMainWindow):
         byServiceLayout = QVBoxLayout()
         byServiceLayout.setSpacing(12)  # More spacing
         
-        self.standardPostStatsLabel = QLabel("Standard Post:\n  Waiting: 0 | Avg Wait: 0.0 min")
-        self.standardPostStatsLabel.setStyleSheet("padding: 5px;")
-        byServiceLayout.addWidget(self.standardPostStatsLabel)
-        
-        self.passportsStatsLabel = QLabel("Passports:\n  Waiting: 0 | Avg Wait: 0.0 min")
-        self.passportsStatsLabel.setStyleSheet("padding: 5px;")
-        byServiceLayout.addWidget(self.passportsStatsLabel)
-        
-        self.parcelsStatsLabel = QLabel("Parcels:\n  Waiting: 0 | Avg Wait: 0.0 min")
-        self.parcelsStatsLabel.setStyleSheet("padding: 5px;")
-        byServiceLayout.addWidget(self.parcelsStatsLabel)
+        self.serviceStatsLabel = QLabel()
+        self.serviceStatsLabel.setTextFormat(Qt.RichText)
+        self.serviceStatsLabel.setStyleSheet("padding: 5px;")
+        byServiceLayout.addWidget(self.serviceStatsLabel)
         
         byServiceGroup.setLayout(byServiceLayout)
         analyticsLayout.addWidget(byServiceGroup)
@@ -625,192 +787,201 @@ class MainWindow(QMainWindow):
             abandonmentEnabled=True
         )
         
-        # Initialize database
-        self.database = DatabaseManager('database/poQueueSim.db')
+        # Initialize database on its own thread so SQLite I/O never blocks the UI
+        self.dbThread = threading.Thread(target=self.dbWorker, args=('database/poQueueSim.db',), daemon=True)
+        self.dbThread.start()
+    
+    def dbWorker(self, dbPath):
+        """Run queued database tasks in order until a None task arrives"""
+        self.database = DatabaseManager(dbPath)
+        while True:
+            task = self.dbQueue.get()
+            if task is None:
+                break
+            try:
+                task()
+            except Exception as e:
+                print(f"Database error: {e}")
+        self.database.close()
+    
+    def startDatabaseRun(self, strategy, timeAcceleration, serviceTimes, abandonmentEnabled):
+        """Record a new simulation run (database thread)"""
+        self.currentRunId = self.database.startSimulationRun(
+            strategy, timeAcceleration, serviceTimes, abandonmentEnabled)
+    
+    def endDatabaseRun(self):
+        """Close off the current simulation run (database thread)"""
+        if self.currentRunId:
+            self.database.endSimulationRun(self.currentRunId)
+    
+    def connectConfigControls(self):
+        """Push configuration changes to the simulator as the widgets change"""
+        self.strategyCombo.currentIndexChanged.connect(self.setDispatchStrategy)
+        self.timeAccelSpin.valueChanged.connect(self.setTimeAcceleration)
+        self.abandonmentCheck.toggled.connect(self.setAbandonmentEnabled)
+        for serviceType, spinBox in self.serviceTimeSpins.items():
+            spinBox.valueChanged.connect(
+                lambda value, serviceType=serviceType: self.setServiceTime(serviceType, value))
+    
+    def setDispatchStrategy(self, index):
+        """Apply the selected dispatch strategy"""
+        with self.simulatorLock:
+            self.simulator.dispatchStrategy = self.strategyMap[index]
+    
+    def setTimeAcceleration(self, value):
+        """Apply the time acceleration setting"""
+        with self.simulatorLock:
+            self.simulator.timeAcceleration = value
+    
+    def setAbandonmentEnabled(self, checked):
+        """Apply the abandonment setting"""
+        with self.simulatorLock:
+            self.simulator.abandonmentEnabled = checked
+    
+    def setServiceTime(self, serviceType, value):
+        """Apply a service time setting"""
+        with self.simulatorLock:
+            self.simulator.serviceTimes[serviceType] = value
     
     def initMicrobit(self):
         """Initialize Micro:bit communicator"""
         self.microbit = MicrobitCommunicator()
         self.microbit.setCallback(self.onMicrobitMessage)
     
-    def setupTimer(self):
-        """Setup update timer"""
-        self.updateTimer = QTimer()
-        self.updateTimer.timeout.connect(self.updateSimulation)
-        self.updateTimer.start(50)  # Update every 50ms
+    def setupWorker(self):
+        """Run the simulation loop on its own thread"""
+        self.simulationThread = QThread()
+        self.simulationWorker = SimulationWorker(self.simulator, self.simulatorLock, 100)  # Step every 100ms
+        self.simulationWorker.moveToThread(self.simulationThread)
+        self.simulationThread.started.connect(self.simulationWorker.start)
+        
+        # Cross-thread signals are queued, so these slots run on the GUI thread
+        self.simulationWorker.snapshotReady.connect(self.applySnapshot)
+        self.simulationWorker.timeAdvanced.connect(self.applySimulationTime)
+        self.simulationThread.start()
     
     def startSimulation(self):
         """Start simulation"""
-        # Update simulator configuration
-        strategyMap = {
-            0: DispatchStrategy.LONGEST_WAIT_FIRST,
-            1: DispatchStrategy.SHORTEST_JOB_FIRST,
-            2: DispatchStrategy.ROUND_ROBIN,
-            3: DispatchStrategy.PRIORITY_ORDER
-        }
-        
-        self.simulator.dispatchStrategy = strategyMap[self.strategyCombo.currentIndex()]
-        self.simulator.timeAcceleration = self.timeAccelSpin.value()
-        self.simulator.abandonmentEnabled = self.abandonmentCheck.isChecked()
-        
-        # Update service times
-        for serviceType, spinBox in self.serviceTimeSpins.items():
-            self.simulator.serviceTimes[serviceType] = spinBox.value()
-        
-        # Start database run
-        self.currentRunId = self.database.startSimulationRun(
-            self.simulator.dispatchStrategy.value,
-            self.simulator.timeAcceleration,
-            self.simulator.serviceTimes,
-            self.simulator.abandonmentEnabled
-        )
+        # Start database run; configuration is applied as the widgets change
+        with self.simulatorLock:
+            runConfig = (
+                self.simulator.dispatchStrategy.value,
+                self.simulator.timeAcceleration,
+                dict(self.simulator.serviceTimes),
+                self.simulator.abandonmentEnabled
+            )
+            self.simulator.running = True
+        self.dbQueue.put(lambda: self.startDatabaseRun(*runConfig))
         
-        self.simulator.running = True
         self.startButton.setEnabled(False)
         self.pauseButton.setEnabled(True)
         self.statusBar.showMessage("Simulation Running")
     
     def pauseSimulation(self):
         """Pause simulation"""
-        self.simulator.running = False
+        with self.simulatorLock:
+            self.simulator.running = False
+        
         self.startButton.setEnabled(True)
         self.pauseButton.setEnabled(False)
         self.statusBar.showMessage("Simulation Paused")
     
     def resetSimulation(self):
         """Reset simulation"""
-        if self.currentRunId:
-            self.database.endSimulationRun(self.currentRunId)
+        self.dbQueue.put(self.endDatabaseRun)
         
-        self.simulator.reset()
+        with self.simulatorLock:
+            self.simulator.reset()
         self.updateDisplay()
         self.statusBar.showMessage("Simulation Reset")
     
-    def updateSimulation(self):
-        """Update simulation state"""
-        if self.simulator.running:
-            self.simulator.update()
-            self.updateDisplay()
-    
     def updateDisplay(self):
-        """Update all display elements"""
-        # Update queue visualizations
-        queueLengths = self.simulator.getQueueLengths()
-        for serviceType, viz in self.queueVisualizations.items():
-            viz.updateQueue(queueLengths[serviceType])
-        
-        # Update booth displays
-        serverStates = self.simulator.getServerStates()
-        boothStates = self.simulator.getBoothStates()
-        
-        for booth in boothStates:
-            boothId = booth['boothId']
-            if booth['occupied']:
-                # Find server at this booth
-                serverAtBooth = next((s for s in serverStates if s['boothId'] == boothId), None)
-                if serverAtBooth:
-                    self.boothDisplays[boothId].updateStatus(
-                        True,
-                        serverAtBooth['serverId'],
-                        serverAtBooth['serviceType'],
-                        serverAtBooth['timeRemaining']
-                    )
-            else:
-                self.boothDisplays[boothId].updateStatus(False, None, None, 0)
-        
-        # Update server displays
-        for serverState in serverStates:
-            serverId = serverState['serverId']
-            self.serverDisplays[serverId].updateStatus(
-                serverState['state'],
-                serverState['boothId'],
-                serverState['serviceType']
-            )
-        
-        # Update statistics
-        stats = self.simulator.getStatistics()
-        self.simTimeLabel.setText(f"Simulation Time: {stats['simulationTime']:.1f} min")
-        self.totalCustomersLabel.setText(f"Total Customers: {stats['totalCustomers']}")
-        self.servedLabel.setText(f"Served: {stats['totalServed']}")
-        self.abandonedLabel.setText(f"Abandoned: {stats['totalAbandoned']}")
-        self.avgWaitLabel.setText(f"Avg Wait: {stats['avgWaitTime']:.1f} min")
-        
-        # Update analytics tab
-        self.updateAnalytics(queueLengths, serverStates, boothStates, stats)
-    
-    def updateAnalytics(self, queueLengths, serverStates, boothStates, stats):
-        """Update analytics tab with current statistics"""
-        # Calculate per-service statistics
-        serviceStats = {
-            'standard_post': {'waiting': queueLengths['standard_post'], 'avgWait': 0, 'served': 0},
-            'passports': {'waiting': queueLengths['passports'], 'avgWait': 0, 'served': 0},
-            'parcels': {'waiting': queueLengths['parcels'], 'avgWait': 0, 'served': 0}
-        }
-        
-        # Calculate average wait times per service type
-        for customer in self.simulator.completedCustomers:
-            if customer.serviceType in serviceStats:
-                waitDuration = customer.getWaitDuration() or 0
-                serviceStats[customer.serviceType]['served'] += 1
-                serviceStats[customer.serviceType]['avgWait'] += waitDuration
-        
-        for serviceType in serviceStats:
-            if serviceStats[serviceType]['served'] > 0:
-                serviceStats[serviceType]['avgWait'] /= serviceStats[serviceType]['served']
-        
-        # Update service type labels
-        self.standardPostStatsLabel.setText(
-            f"Standard Post:\n"
-            f"  Waiting: {serviceStats['standard_post']['waiting']} | "
-            f"Served: {serviceStats['standard_post']['served']} | "
-            f"Avg Wait: {serviceStats['standard_post']['avgWait']:.1f} min"
-        )
-        
-        self.passportsStatsLabel.setText(
-            f"Passports:\n"
-            f"  Waiting: {serviceStats['passports']['waiting']} | "
-            f"Served: {serviceStats['passports']['served']} | "
-            f"Avg Wait: {serviceStats['passports']['avgWait']:.1f} min"
-        )
-        
-        self.parcelsStatsLabel.setText(
-            f"Parcels:\n"
-            f"  Waiting: {serviceStats['parcels']['waiting']} | "
-            f"Served: {serviceStats['parcels']['served']} | "
-            f"Avg Wait: {serviceStats['parcels']['avgWait']:.1f} min"
-        )
-        
-        # Calculate server utilization
-        busyServers = sum(1 for s in serverStates if s['state'] == 'busy')
-        serverUtilPercent = (busyServers / len(serverStates)) * 100
-        self.serverUtilLabel.setText(f"Busy Servers: {busyServers} / {len(serverStates)} ({serverUtilPercent:.0f}%)")
-        
-        # Calculate booth utilization
-        occupiedBooths = sum(1 for b in boothStates if b['occupied'])
-        boothUtilPercent = (occupiedBooths / len(boothStates)) * 100
-        self.boothUtilLabel.setText(f"Occupied Booths: {occupiedBooths} / {len(boothStates)} ({boothUtilPercent:.0f}%)")
-        
-        # Calculate throughput (customers per hour)
-        simTimeHours = stats['simulationTime'] / 60.0
-        throughput = stats['totalServed'] / simTimeHours if simTimeHours > 0 else 0
-        self.throughputLabel.setText(f"Throughput: {throughput:.1f} customers/hour")
-        
-        # Calculate abandonment rate
-        abandonmentRate = 0
-        if stats['totalCustomers'] > 0:
-            abandonmentRate = (stats['totalAbandoned'] / stats['totalCustomers']) * 100
-        self.abandonmentRateLabel.setText(f"Abandonment Rate: {abandonmentRate:.1f}%")
+        """Redraw everything from the simulator's current state"""
+        with self.simulatorLock:
+            snapshot = takeSnapshot(self.simulator)
+            self.simulator.dirty = False
+        self.applySnapshot(snapshot)
+    
+    def applySimulationTime(self, simulationTime):
+        """Update the simulation clock"""
+        self.setLabelText(self.simTimeLabel, SIM_TIME_TEXT, round(simulationTime, 1))
+    
+    def applySnapshot(self, snapshot):
+        """Update all display elements from a simulator snapshot (widgets only, no simulator access)"""
+        # Hold repaints until every panel is updated so Qt paints them in one pass
+        panel = self.centralWidget()
+        panel.setUpdatesEnabled(False)
+        try:
+            # Update queue visualizations
+            queueLengths = snapshot['queueLengths']
+            for serviceType, viz in self.queueVisualizations.items():
+                viz.updateQueue(queueLengths[serviceType])
+            
+            # Update booth displays
+            boothColumns = snapshot['boothColumns']
+            for boothId, (occupied, serverId, serviceType, timeRemaining) in enumerate(zip(*boothColumns)):
+                if occupied:
+                    self.boothDisplays[boothId].updateStatus(True, serverId, serviceType, timeRemaining)
+                else:
+                    self.boothDisplays[boothId].updateStatus(False, None, None, 0)
+            
+            # Update server displays
+            serverColumns = snapshot['serverColumns']
+            for serverId, (state, boothId, serviceType) in enumerate(zip(*serverColumns)):
+                self.serverDisplays[serverId].updateStatus(state, boothId, serviceType)
+        finally:
+            panel.setUpdatesEnabled(True)
+        
+        # Update statistics; the counters are left for the stats timer
+        stats = snapshot['stats']
+        self.setLabelText(self.simTimeLabel, SIM_TIME_TEXT, round(stats['simulationTime'], 1))
+        self.pendingAnalytics = snapshot['analytics']
+    
+    def flushAnalytics(self):
+        """Draw the statistics and analytics tab from the latest snapshot, if one arrived"""
+        if self.pendingAnalytics is None:
+            return
+        analytics, self.pendingAnalytics = self.pendingAnalytics, None
+        self.updateAnalytics(analytics)
+    
+    def updateAnalytics(self, analytics):
+        """Update the statistics labels and analytics tab from precomputed label values"""
+        # Skip the redraw when nothing shown has changed
+        key = (analytics, self.currentRunId)
+        if key == self.lastAnalyticsKey:
+            return
+        self.lastAnalyticsKey = key
+        
+        self.setLabelText(self.statsLabel, STATS_TEXT, *analytics['stats'])
+        self.setLabelText(self.serviceStatsLabel, SERVICE_STATS_TEXT, *analytics['serviceStats'])
+        self.setLabelText(self.serverUtilLabel, SERVER_UTIL_TEXT, *analytics['serverUtil'])
+        self.setLabelText(self.boothUtilLabel, BOOTH_UTIL_TEXT, *analytics['boothUtil'])
+        self.setLabelText(self.throughputLabel, THROUGHPUT_TEXT, *analytics['throughput'])
+        self.setLabelText(self.abandonmentRateLabel, ABANDONMENT_RATE_TEXT, *analytics['abandonmentRate'])
         
         # Update run ID
         if self.currentRunId:
-            self.currentRunLabel.setText(f"Current Run ID: {self.currentRunId}")
+            self.setLabelText(self.currentRunLabel, RUN_ID_TEXT, self.currentRunId)
+    
+    def setLabelText(self, label, template, *values):
+        """Fill a label's text template, skipping the setText when its values are unchanged"""
+        if self.labelValues.get(label) != values:
+            self.labelValues[label] = values
+            label.setText(template % values)
     
     def addCustomer(self, serviceType):
         """Add a customer to the queue"""
         if self.simulator:
-            customer = self.simulator.addCustomer(serviceType)
+            with self.simulatorLock:
+                customer = self.simulator.addCustomer(serviceType)
             if customer:
-                self.statusBar.showMessage(f"Customer added to {serviceType.replace('_', ' ').title()} queue", 2000)
+                self.statusBar.showMessage(f"Customer added to {SERVICE_DISPLAY_NAME.get(serviceType, 'Unknown')} queue", 2000)
+    
+    def addPendingCustomers(self):
+        """Add every customer queued by the Micro:bit thread"""
+        self.customerWakePending = False
+        while self.pendingCustomers:
+            self.addCustomer(self.pendingCustomers.popleft())
     
     def connectMicrobit(self):
         """Connect to Micro:bit"""
@@ -828,26 +999,54 @@ class MainWindow(QMainWindow):
     
     def onMicrobitMessage(self, serviceType, timestamp):
         """Handle message from Micro:bit - runs in serial thread, emit signal for GUI thread"""
-        # Emit signal to GUI thread instead of directly calling addCustomer
-        self.signals.customerAdded.emit(serviceType)
+        # deque append/popleft are thread-safe; only wake the GUI thread if it isn't already due to drain
+        self.pendingCustomers.append(serviceType)
+        if not self.customerWakePending:
+            self.customerWakePending = True
+            self.signals.customersPending.emit()
     
     def closeEvent(self, event):
         """Handle window close event"""
+        # Start the database shutdown first so it runs on its own thread while the
+        # simulation and Micro:bit threads are stopped here
+        if self.dbThread:
+            # The None task stops the database thread once pending writes are done
+            self.dbQueue.put(self.endDatabaseRun)
+            self.dbQueue.put(None)
+        
+        # Stopping the thread's event loop also stops the worker's step chain
+        self.simulationThread.quit()
+        self.simulationThread.wait()
         if self.microbit:
             self.microbit.disconnect()
-        if self.database:
-            if self.currentRunId:
-                self.database.endSimulationRun(self.currentRunId)
-            self.database.close()
+        if self.dbThread:
+            self.dbThread.join()
         event.accept()
 
 
+def setupLogging():
+    """Send log records through a queue so worker threads never block on console output"""
+    logQueue = queue.Queue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(logQueue, handler)
+    
+    rootLogger = logging.getLogger()
+    rootLogger.addHandler(logging.handlers.QueueHandler(logQueue))
+    rootLogger.setLevel(logging.INFO)
+    listener.start()
+    return listener
+
+
 def main():
     """Main entry point"""
+    logListener = setupLogging()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
+    exitCode = app.exec_()
+    logListener.stop()  # Flush any queued records before exiting
+    sys.exit(exitCode)
 
 
 if __name__ == '__main__':
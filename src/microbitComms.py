@@ -3,45 +3,89 @@ Serial Communication Handler for Micro:bit
 Listens for button press events from Micro:bit via serial USB
 """
 
+import logging
+import os
+import queue
+import sys
+import selectors
+import struct
 import serial
 import serial.tools.list_ports
 import threading
 import time
 
+# Linux serial ioctls for switching USB-serial adapters out of their 16 ms latency timer
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 0x2000
+SERIAL_STRUCT_FLAGS_INDEX = 4  # flags follows type, line, port and irq in struct serial_struct
+
+# Windows driver buffer sizes; the default 4 KiB receive buffer can overrun if the reader stalls
+WINDOWS_RX_BUFFER_SIZE = 65536
+WINDOWS_TX_BUFFER_SIZE = 4096
+
+SERVICE_REQUEST_PREFIX = 'SERVICE_REQUEST,'
+
+# Readiness handshake answered by the Micro:bit firmware; older firmware never replies,
+# so the wait is bounded by READY_TIMEOUT
+READY_REQUEST = b'PING\n'
+READY_REPLY = b'PONG\n'
+READY_TIMEOUT = 2.0
+
+# comports() can take hundreds of milliseconds on Windows, so results are reused briefly
+PORT_CACHE_TTL = 2.0
+_portCache = {'time': 0.0, 'ports': None}
+
+
+def cachedComports(ttl=PORT_CACHE_TTL):
+    """List serial ports, reusing the previous enumeration if it is under ttl seconds old"""
+    now = time.monotonic()
+    if _portCache['ports'] is None or now - _portCache['time'] >= ttl:
+        _portCache['ports'] = list(serial.tools.list_ports.comports())
+        _portCache['time'] = now
+    return _portCache['ports']
+
+
 class MicrobitCommunicator:
     """Handles serial communication with Micro:bit"""
     
-    def __init__(self, baudRate=115200, timeout=1):
+    # Micro:bit USB identifiers: VID:PID (most reliable) and lower-cased description keywords
+    MICROBIT_USB_IDS = {(0x0D28, 0x0204)}
+    MICROBIT_KEYWORDS = ('micro:bit', 'microbit', 'bbc', 'daplink', 'mbed')
+    
+    def __init__(self, baudRate=115200, timeout=0.5):
         """Initialize Micro:bit communicator"""
         self.baudRate = baudRate
         self.timeout = timeout
+        self.log = logging.getLogger('microbit')
         self.serialPort = None
         self.connected = False
         self.listening = False
         self.listenerThread = None
+        self.stopEvent = threading.Event()  # Set to stop the listener thread
+        self.wakePipe = None  # (read fd, write fd) used to wake the listener's selector on POSIX
         self.callback = None
+        self.receiveBuffer = bytearray()  # Bytes received but not yet ending in a newline
+        self.cachedPort = None  # Last auto-detected port, reused on reconnect
+        self.sendQueue = queue.Queue()  # Outgoing messages; None stops the sender thread
+        self.senderThread = None
     
     def findMicrobit(self):
         """Automatically find Micro:bit serial port"""
-        ports = serial.tools.list_ports.comports()
+        if self.cachedPort:
+            return self.cachedPort
         
-        # Look for common Micro:bit identifiers
-        microbitKeywords = ['micro:bit', 'microbit', 'BBC', 'DAPLink', 'mbed']
-        
-        for port in ports:
-            portDesc = port.description.lower()
-            portName = port.device.lower()
-            
-            # Check for Micro:bit Vendor ID and Product ID (most reliable)
-            if hasattr(port, 'vid') and hasattr(port, 'pid'):
-                if port.vid == 0x0D28 and port.pid == 0x0204:
-                    print(f"Found Micro:bit on {port.device} (VID:PID match)")
-                    return port.device
+        for port in cachedComports():
+            if (getattr(port, 'vid', None), getattr(port, 'pid', None)) in self.MICROBIT_USB_IDS:
+                self.log.info("Found Micro:bit on %s (VID:PID match)", port.device)
+                self.cachedPort = port.device
+                return port.device
             
             # Fallback to keyword search
-            for keyword in microbitKeywords:
-                if keyword.lower() in portDesc or keyword.lower() in portName:
-                    return port.device
+            portText = f"{port.description} {port.device}".lower()
+            if any(keyword in portText for keyword in self.MICROBIT_KEYWORDS):
+                self.cachedPort = port.device
+                return port.device
         
         return None
     
@@ -56,10 +100,11 @@ class MicrobitCommunicator:
         Returns:
             bool: True if connected successfully
         """
+        usedCachedPort = portName is None and self.cachedPort is not None
         if portName is None:
             portName = self.findMicrobit()
             if portName is None:
-                print("Could not auto-detect Micro:bit. Please specify port manually.")
+                self.log.warning("Could not auto-detect Micro:bit. Please specify port manually.")
                 return False
         
         try:
@@ -68,21 +113,83 @@ class MicrobitCommunicator:
                 baudrate=self.baudRate,
                 timeout=self.timeout
             )
+            self._enableLowLatency()
+            if sys.platform == 'win32':
+                try:
+                    self.serialPort.set_buffer_size(rx_size=WINDOWS_RX_BUFFER_SIZE,
+                                                    tx_size=WINDOWS_TX_BUFFER_SIZE)
+                except (serial.SerialException, ValueError):
+                    pass  # Keep the driver's default buffers
+            # Handshake before the port counts as connected, so a failure leaves nothing running
+            self._waitUntilReady()
             self.connected = True
-            print(f"Connected to Micro:bit on {portName}")
-            time.sleep(2)  # Give time for connection to stabilize
+            self.senderThread = threading.Thread(target=self._sendLoop, daemon=True)
+            self.senderThread.start()
+            self.log.info("Connected to Micro:bit on %s", portName)
             return True
         except serial.SerialException as e:
-            print(f"Failed to connect to {portName}: {e}")
+            self.log.error("Failed to connect to %s: %s", portName, e)
+            self.connected = False
+            if self.senderThread:
+                self.sendQueue.put(None)  # Stop the sender before its port goes away
+                self.senderThread.join(timeout=2)
+                self.senderThread = None
+            if self.serialPort and self.serialPort.is_open:
+                self.serialPort.close()
+            self.serialPort = None
+            if usedCachedPort:
+                # The cached port may be stale (device unplugged/renumbered); scan again,
+                # bypassing the port-list cache, which may still hold the dead port
+                self.cachedPort = None
+                _portCache['ports'] = None
+                return self.connect()
             return False
     
+    def _waitUntilReady(self):
+        """Wait for the Micro:bit to answer a PING, or READY_TIMEOUT seconds at most"""
+        self.serialPort.write(READY_REQUEST)
+        self.serialPort.timeout = READY_TIMEOUT
+        try:
+            reply = self.serialPort.read_until(READY_REPLY)
+        finally:
+            self.serialPort.timeout = self.timeout
+        
+        # Button presses that arrived ahead of the reply still count (the last
+        # element is empty or a partial line)
+        for line in reply.split(b'\n')[:-1]:
+            line = line.strip()
+            if line and line != b'PONG':
+                self._processMessage(line.decode('utf-8', 'replace'))
+        
+        if not reply.endswith(READY_REPLY):
+            self.log.info("No readiness reply from Micro:bit; continuing")
+    
+    def _enableLowLatency(self):
+        """Ask the Linux serial driver to deliver bytes immediately (no-op elsewhere)"""
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            import fcntl
+            fd = self.serialPort.fileno()
+            buf = bytearray(struct.calcsize('32i'))
+            fcntl.ioctl(fd, TIOCGSERIAL, buf)
+            fields = list(struct.unpack('32i', buf))
+            fields[SERIAL_STRUCT_FLAGS_INDEX] |= ASYNC_LOW_LATENCY
+            fcntl.ioctl(fd, TIOCSSERIAL, struct.pack('32i', *fields))
+        except (OSError, ValueError):
+            pass  # Drivers without TIOCSSERIAL support keep their default timing
+    
     def disconnect(self):
         """Disconnect from Micro:bit"""
         self.stopListening()
+        if self.senderThread:
+            self.sendQueue.put(None)  # Sender writes anything already queued, then exits
+            self.senderThread.join(timeout=2)
+            self.senderThread = None
         if self.serialPort and self.serialPort.is_open:
             self.serialPort.close()
         self.connected = False
-        print("Disconnected from Micro:bit")
+        self.log.info("Disconnected from Micro:bit")
     
     def setCallback(self, callback):
         """
@@ -97,41 +204,92 @@ class MicrobitCommunicator:
     def startListening(self):
         """Start listening for messages from Micro:bit in background thread"""
         if not self.connected:
-            print("Not connected to Micro:bit")
+            self.log.warning("Not connected to Micro:bit")
             return False
         
         if self.listening:
-            print("Already listening")
+            self.log.info("Already listening")
             return True
         
         self.listening = True
+        self.stopEvent.clear()
+        if os.name == 'posix':
+            self.wakePipe = os.pipe()
         self.listenerThread = threading.Thread(target=self._listenLoop, daemon=True)
         self.listenerThread.start()
-        print("Started listening for Micro:bit messages")
+        self.log.info("Started listening for Micro:bit messages")
         return True
     
     def stopListening(self):
         """Stop listening for messages"""
         self.listening = False
+        self.stopEvent.set()
+        
+        # Wake the listener straight away: the pipe interrupts its selector on POSIX,
+        # cancel_read interrupts a blocking read elsewhere (pyserial >= 3.1)
+        if self.wakePipe:
+            os.write(self.wakePipe[1], b'\0')
+        elif self.serialPort and hasattr(self.serialPort, 'cancel_read'):
+            self.serialPort.cancel_read()
         if self.listenerThread:
             self.listenerThread.join(timeout=2)
-        print("Stopped listening for Micro:bit messages")
+            self.listenerThread = None
+        if self.wakePipe:
+            for fd in self.wakePipe:
+                os.close(fd)
+            self.wakePipe = None
+        self.log.info("Stopped listening for Micro:bit messages")
     
     def _listenLoop(self):
         """Internal loop for listening to serial messages"""
-        while self.listening and self.connected:
+        # Wait for the port to become readable (or the timeout), then drain whatever
+        # has arrived in one read rather than reading a byte at a time
+        serialPort = self.serialPort
+        buffer = self.receiveBuffer
+        buffer.clear()
+        
+        # On POSIX the kernel wakes the selector when data arrives; Windows serial
+        # handles can't be selected on, so there a blocking read(1) does the waiting
+        selector = None
+        if self.wakePipe:
+            selector = selectors.DefaultSelector()
+            selector.register(serialPort.fileno(), selectors.EVENT_READ)
+            selector.register(self.wakePipe[0], selectors.EVENT_READ)
+        
+        stopEvent = self.stopEvent
+        while not stopEvent.is_set() and self.connected:
             try:
-                if self.serialPort and self.serialPort.in_waiting > 0:
-                    line = self.serialPort.readline().decode('utf-8').strip()
-                    self._processMessage(line)
+                if selector:
+                    if not selector.select(timeout=self.timeout) or stopEvent.is_set():
+                        continue
+                    buffer += serialPort.read(serialPort.in_waiting or 1)
+                else:
+                    chunk = serialPort.read(1)
+                    if not chunk:
+                        continue
+                    buffer += chunk
+                    waiting = serialPort.in_waiting
+                    if waiting:
+                        buffer += serialPort.read(waiting)
+                
+                # Process every complete line, keeping any partial line for the next read
+                end = buffer.find(b'\n')
+                while end >= 0:
+                    # Strip in bytes before decoding; 'replace' keeps a corrupted byte from raising
+                    line = buffer[:end].strip()
+                    del buffer[:end + 1]
+                    if line:
+                        self._processMessage(line.decode('utf-8', 'replace'))
+                    end = buffer.find(b'\n')
             except serial.SerialException as e:
-                print(f"Serial error: {e}")
+                self.log.error("Serial error: %s", e)
                 self.connected = False
                 break
             except Exception as e:
-                print(f"Error processing message: {e}")
-            
-            time.sleep(0.01)  # Small delay to prevent CPU spinning
+                self.log.exception("Error processing message: %s", e)
+        
+        if selector:
+            selector.close()
     
     def _processMessage(self, message):
         """
@@ -139,19 +297,17 @@ class MicrobitCommunicator:
         
         Expected format: SERVICE_REQUEST,service_type,timestamp
         """
-        if not message:
+        # Check the prefix before splitting so other lines (e.g. REPL output) cost nothing
+        if not message or not message.startswith(SERVICE_REQUEST_PREFIX):
             return
         
-        parts = message.split(',')
+        serviceType, hasTimestamp, rest = message[len(SERVICE_REQUEST_PREFIX):].partition(',')
+        timestamp = rest.partition(',')[0] if hasTimestamp else None
         
-        if len(parts) >= 2 and parts[0] == 'SERVICE_REQUEST':
-            serviceType = parts[1]
-            timestamp = parts[2] if len(parts) > 2 else None
-            
-            print(f"Received service request: {serviceType}")
-            
-            if self.callback:
-                self.callback(serviceType, timestamp)
+        self.log.debug("Received service request: %s", serviceType)
+        
+        if self.callback:
+            self.callback(serviceType, timestamp)
     
     def sendMessage(self, message):
         """
@@ -160,20 +316,48 @@ class MicrobitCommunicator:
         Args:
             message: String message to send
         """
+        return self.sendMessages([message])
+    
+    def sendMessages(self, messages):
+        """
+        Queue several messages for the Micro:bit
+        
+        Args:
+            messages: Iterable of string messages to send
+        """
         if not self.connected or not self.serialPort:
-            print("Not connected to Micro:bit")
+            self.log.warning("Not connected to Micro:bit")
             return False
         
-        try:
-            self.serialPort.write(f"{message}\n".encode('utf-8'))
-            return True
-        except serial.SerialException as e:
-            print(f"Failed to send message: {e}")
-            return False
+        for message in messages:
+            self.sendQueue.put(message)
+        return True
+    
+    def _sendLoop(self):
+        """Internal loop that writes queued messages, batching whatever is waiting into one write"""
+        running = True
+        while running:
+            batch = [self.sendQueue.get()]
+            try:
+                while True:
+                    batch.append(self.sendQueue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            if None in batch:
+                running = False
+                batch = [message for message in batch if message is not None]
+                if not batch:
+                    break
+            
+            try:
+                self.serialPort.write('\n'.join(batch).encode('utf-8') + b'\n')
+            except serial.SerialException as e:
+                self.log.error("Failed to send message: %s", e)
     
     def listAvailablePorts(self):
         """List all available serial ports"""
-        ports = serial.tools.list_ports.comports()
+        ports = cachedComports()
         print("\nAvailable serial ports:")
         for i, port in enumerate(ports):
             print(f"{i+1}. {port.device} - {port.description}")
@@ -186,6 +370,8 @@ class MicrobitCommunicator:
 
 # Example usage and testing
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     def testCallback(serviceType, timestamp):
         print(f"Test callback: Service={serviceType}, Timestamp={timestamp}")
     
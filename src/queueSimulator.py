@@ -5,8 +5,16 @@ Handles queue management, server allocation, and booth assignment
 
 import time
 import random
+import heapq
+from array import array
 from collections import deque
 from enum import Enum
+from operator import sub
+
+
+# Completed/abandoned customers kept for inspection; totals come from running counters
+CUSTOMER_HISTORY_SIZE = 10000
+
 
 class DispatchStrategy(Enum):
     """Available dispatch strategies for server assignment"""
@@ -15,14 +23,50 @@ class DispatchStrategy(Enum):
     ROUND_ROBIN = "round_robin"
     PRIORITY_ORDER = "priority_order"
 
+# Customer selection method for each strategy; unknown strategies fall back to longest wait first
+STRATEGY_SELECTORS = {
+    DispatchStrategy.LONGEST_WAIT_FIRST: '_selectLongestWaitFirst',
+    DispatchStrategy.SHORTEST_JOB_FIRST: '_selectShortestJobFirst',
+    DispatchStrategy.ROUND_ROBIN: '_selectRoundRobin',
+    DispatchStrategy.PRIORITY_ORDER: '_selectPriorityOrder'
+}
+
 class ServerState(Enum):
     """Server states"""
     IDLE = "idle"
     BUSY = "busy"
     SPARE = "spare"
 
+# Abandonment hazard (chance per simulated minute of leaving): none for the first
+# 5 minutes, rising 5% per minute until 10 minutes, then a flat 50%
+ABANDON_GRACE = 5.0
+ABANDON_RAMP_END = 10.0
+ABANDON_RAMP_SLOPE = 0.05
+ABANDON_MAX_HAZARD = 0.5
+# Cumulative hazard accumulated by the end of the ramp
+ABANDON_RAMP_HAZARD = 0.5 * ABANDON_RAMP_SLOPE * (ABANDON_RAMP_END - ABANDON_GRACE) ** 2
+
+def cumulativeAbandonHazard(wait):
+    """Cumulative abandonment hazard a customer has been exposed to after waiting this long"""
+    if wait <= ABANDON_GRACE:
+        return 0.0
+    if wait <= ABANDON_RAMP_END:
+        return 0.5 * ABANDON_RAMP_SLOPE * (wait - ABANDON_GRACE) ** 2
+    return ABANDON_RAMP_HAZARD + (wait - ABANDON_RAMP_END) * ABANDON_MAX_HAZARD
+
+def abandonmentDelay(exposure):
+    """Wait after which a customer gives up, from an Exp(1) draw (inverse of the cumulative hazard)"""
+    if exposure <= ABANDON_RAMP_HAZARD:
+        return ABANDON_GRACE + (2.0 * exposure / ABANDON_RAMP_SLOPE) ** 0.5
+    return ABANDON_RAMP_END + (exposure - ABANDON_RAMP_HAZARD) / ABANDON_MAX_HAZARD
+
 class Customer:
     """Represents a customer in the queue"""
+    # Fixed attribute set: no per-instance __dict__ for the customers held in queues and in
+    # the bounded completed/abandoned history (up to CUSTOMER_HISTORY_SIZE each)
+    __slots__ = ('customerId', 'serviceType', 'arrivalTime', 'queueJoinTime',
+                 'serviceStartTime', 'serviceEndTime', 'waitDuration', 'serverId', 'boothId', 'outcome',
+                 'abandonTime')
     _nextId = 1
     
     def __init__(self, serviceType, arrivalTime):
@@ -33,28 +77,30 @@ class Customer:
         self.queueJoinTime = arrivalTime
         self.serviceStartTime = None
         self.serviceEndTime = None
+        self.waitDuration = None  # Set when service starts
         self.serverId = None
         self.boothId = None
         self.outcome = None  # 'completed' or 'abandoned'
+        self.abandonTime = None  # Simulation time the customer gives up if still queued
     
     def getWaitDuration(self):
-        """Calculate wait duration"""
-        if self.serviceStartTime:
-            return self.serviceStartTime - self.queueJoinTime
-        return None
+        """Get wait duration (None until service starts); hot paths read waitDuration directly"""
+        return self.waitDuration
     
     def getServiceDuration(self):
-        """Calculate service duration"""
-        if self.serviceStartTime and self.serviceEndTime:
+        """Calculate service duration (None until service ends); hot paths subtract the times directly"""
+        if self.serviceStartTime is not None and self.serviceEndTime is not None:
             return self.serviceEndTime - self.serviceStartTime
         return None
 
 class Server:
     """Represents a server (staff member)"""
+    __slots__ = ('serverId', 'state', 'available', 'currentCustomer', 'currentBoothId', 'serviceEndTime')
     
     def __init__(self, serverId):
         self.serverId = serverId
         self.state = ServerState.SPARE
+        self.available = True  # Mirrors state == SPARE, for the dispatcher's per-tick scan
         self.currentCustomer = None
         self.currentBoothId = None
         self.serviceEndTime = None
@@ -62,6 +108,7 @@ class Server:
     def startService(self, customer, boothId, serviceEndTime):
         """Assign server to serve a customer at a booth"""
         self.state = ServerState.BUSY
+        self.available = False
         self.currentCustomer = customer
         self.currentBoothId = boothId
         self.serviceEndTime = serviceEndTime
@@ -73,14 +120,16 @@ class Server:
         self.currentBoothId = None
         self.serviceEndTime = None
         self.state = ServerState.SPARE
+        self.available = True
         return customer
     
     def isAvailable(self):
         """Check if server is available"""
-        return self.state == ServerState.SPARE
+        return self.available
 
 class Booth:
     """Represents a service booth"""
+    __slots__ = ('boothId', 'occupied', 'serverId')
     
     def __init__(self, boothId):
         self.boothId = boothId
@@ -107,7 +156,7 @@ class QueueSimulator:
     """Main queue simulation engine"""
     
     def __init__(self, numServers=5, numBooths=4, dispatchStrategy=DispatchStrategy.LONGEST_WAIT_FIRST,
-                 serviceTimes=None, timeAcceleration=20.0, abandonmentEnabled=True):
+                 serviceTimes=None, timeAcceleration=20.0, abandonmentEnabled=True, seed=None):
         """
         Initialize queue simulator
         
@@ -118,12 +167,14 @@ class QueueSimulator:
             serviceTimes: Dict of service times in minutes {service_type: duration}
             timeAcceleration: Simulation speed multiplier (default 20x)
             abandonmentEnabled: Whether customers can abandon queues
+            seed: Random seed for reproducible runs (default None, seeded from the OS)
         """
         self.numServers = numServers
         self.numBooths = numBooths
         self.dispatchStrategy = dispatchStrategy
         self.timeAcceleration = timeAcceleration
         self.abandonmentEnabled = abandonmentEnabled
+        self.rng = random.Random(seed)  # Per-simulator generator, independent of the global random state
         
         # Service times in minutes
         self.serviceTimes = serviceTimes or {
@@ -136,6 +187,16 @@ class QueueSimulator:
         self.servers = [Server(i) for i in range(numServers)]
         self.booths = [Booth(i) for i in range(numBooths)]
         
+        # State dicts handed out by getServerStates/getBoothStates, refreshed in place
+        self.serverStateCache = [
+            {'serverId': i, 'state': '', 'boothId': None, 'customerId': None, 'serviceType': None, 'timeRemaining': 0}
+            for i in range(numServers)
+        ]
+        self.boothStateCache = [
+            {'boothId': i, 'occupied': False, 'serverId': None, 'serviceType': None, 'timeRemaining': 0}
+            for i in range(numBooths)
+        ]
+        
         # Initialize queues for each service type
         self.queues = {
             'standard_post': deque(),
@@ -147,29 +208,114 @@ class QueueSimulator:
         self.simulationTime = 0.0  # Simulation time in minutes
         self.running = False
         self.lastUpdateTime = None
+        self.dirty = True  # Set when displayed state changes; cleared by the GUI after redrawing
+        self.completionHeap = []  # (serviceEndTime, serverId) for every busy server
+        self.abandonHeap = []  # (abandonTime, customerId, customer); served customers are skipped
+        self.abandonHeapStale = 0  # Entries in abandonHeap for customers already being served
         
         # Statistics
         self.totalCustomersServed = 0
         self.totalCustomersAbandoned = 0
-        self.completedCustomers = []
-        self.abandonedCustomers = []
+        self.completedCustomers = deque(maxlen=CUSTOMER_HISTORY_SIZE)
+        self.abandonedCustomers = deque(maxlen=CUSTOMER_HISTORY_SIZE)
+        self.totalWaitSum = 0.0
+        self.totalServiceSum = 0.0
+        self.busyServerCount = 0  # Kept in step with server/booth state changes
+        self.occupiedBoothCount = 0
+        
+        # Every served customer as parallel columns (one entry per customer), so history
+        # analysis reads flat float arrays instead of the bounded Customer objects
+        self.completedColumns = {
+            'arrivalTime': array('d'),
+            'queueJoinTime': array('d'),
+            'serviceStartTime': array('d'),
+            'serviceEndTime': array('d'),
+            'serverId': array('i')
+        }
+        
+        # Per-service running totals, updated as customers complete
+        self.serviceServedCount = {serviceType: 0 for serviceType in self.queues}
+        self.serviceWaitSum = {serviceType: 0.0 for serviceType in self.queues}
         
         # Round robin counter for round robin strategy
         self.roundRobinIndex = 0
         self.serviceTypesList = list(self.queues.keys())
+        self.queueList = list(self.queues.values())  # Same deques, for scanning queue heads
+        
+        # Abandoned customers stay in their queue (outcome set) until they reach the
+        # front or the queue is compacted; these count them per queue
+        self.queueTombstones = {serviceType: 0 for serviceType in self.queues}
+    
+    @property
+    def dispatchStrategy(self):
+        """Strategy for dispatching customers"""
+        return self._dispatchStrategy
+    
+    @dispatchStrategy.setter
+    def dispatchStrategy(self, value):
+        self._dispatchStrategy = value
+        # Bind the strategy's selector once instead of comparing strategies on every assignment
+        self._selectNextCustomer = getattr(self, STRATEGY_SELECTORS.get(value, '_selectLongestWaitFirst'))
+    
+    @property
+    def abandonmentEnabled(self):
+        """Whether customers can abandon queues"""
+        return self._abandonmentEnabled
+    
+    @abandonmentEnabled.setter
+    def abandonmentEnabled(self, value):
+        wasEnabled = getattr(self, '_abandonmentEnabled', True)
+        self._abandonmentEnabled = value
+        if value and not wasEnabled:
+            self._redrawAbandonTimes()
+    
+    @property
+    def timeAcceleration(self):
+        """Simulation speed multiplier"""
+        return self._timeAcceleration
+    
+    @timeAcceleration.setter
+    def timeAcceleration(self, value):
+        self._timeAcceleration = value
+        self._simMinutesPerSecond = value / 60.0  # Real seconds to simulation minutes
     
     def addCustomer(self, serviceType):
         """Add a customer to the appropriate queue"""
-        if serviceType not in self.queues:
+        queue = self.queues.get(serviceType)  # One lookup both validates the type and finds the queue
+        if queue is None:
             return None
         
         customer = Customer(serviceType, self.simulationTime)
-        self.queues[serviceType].append(customer)
+        customer.abandonTime = customer.queueJoinTime + abandonmentDelay(self.rng.expovariate(1.0))
+        heapq.heappush(self.abandonHeap, (customer.abandonTime, customer.customerId, customer))
+        queue.append(customer)
+        self.dirty = True
         return customer
     
+    def addCustomers(self, serviceTypes):
+        """Add a customer per service type in order; returns them (None for unknown types)"""
+        queues = self.queues
+        abandonHeap = self.abandonHeap
+        heappush = heapq.heappush
+        expovariate = self.rng.expovariate
+        simulationTime = self.simulationTime
+        customers = []
+        for serviceType in serviceTypes:
+            queue = queues.get(serviceType)
+            if queue is None:
+                customers.append(None)
+                continue
+            customer = Customer(serviceType, simulationTime)
+            customer.abandonTime = simulationTime + abandonmentDelay(expovariate(1.0))
+            heappush(abandonHeap, (customer.abandonTime, customer.customerId, customer))
+            queue.append(customer)
+            customers.append(customer)
+        self.dirty = True
+        return customers
+    
     def update(self):
         """Update simulation state - call this regularly"""
-        currentRealTime = time.time()
+        currentRealTime = time.monotonic()  # Immune to wall-clock adjustments
         
         if self.lastUpdateTime is None:
             self.lastUpdateTime = currentRealTime
@@ -177,153 +323,226 @@ class QueueSimulator:
         
         # Calculate elapsed simulation time
         realDeltaTime = currentRealTime - self.lastUpdateTime
-        simDeltaTime = realDeltaTime * self.timeAcceleration / 60.0  # Convert to simulation minutes
+        simDeltaTime = realDeltaTime * self._simMinutesPerSecond
         
         self.simulationTime += simDeltaTime
         self.lastUpdateTime = currentRealTime
         
+        # Fast path: with no event due and nobody who could be dispatched, a tick only
+        # moves the clock, so skip the three passes below
+        simulationTime = self.simulationTime
+        completionHeap = self.completionHeap
+        abandonHeap = self.abandonHeap
+        if ((not completionHeap or completionHeap[0][0] > simulationTime)
+                and (not abandonHeap or abandonHeap[0][0] > simulationTime)
+                and (self.busyServerCount >= self.numServers or self.occupiedBoothCount >= self.numBooths
+                     or not any(self.queueList))):
+            if not self.dirty:
+                self.dirty = self.busyServerCount > 0
+            return
+        
         # Check for completed services
         self._checkCompletedServices()
         
         # Check for abandonments
-        if self.abandonmentEnabled:
-            self._checkAbandonments()
+        self._checkAbandonments()
         
         # Assign available servers to waiting customers
         self._assignServersToCustomers()
+        
+        # Busy servers show a service countdown, so their booths change every tick
+        if not self.dirty:
+            self.dirty = self.busyServerCount > 0
+    
+    def runUntil(self, endTime):
+        """Advance simulation time to endTime without the wall clock (for headless/batch runs)"""
+        # Jump straight from one scheduled event to the next, so a run costs time in
+        # proportion to its events rather than to a fixed tick rate
+        completionHeap = self.completionHeap
+        abandonHeap = self.abandonHeap
+        checkCompletedServices = self._checkCompletedServices
+        checkAbandonments = self._checkAbandonments
+        assignServersToCustomers = self._assignServersToCustomers
+        while True:
+            # Settle the current instant first, so waiting customers start service now;
+            # afterwards both heaps hold only future events
+            checkCompletedServices()
+            checkAbandonments()
+            assignServersToCustomers()
+            if self.simulationTime >= endTime:
+                break
+            
+            nextTime = endTime
+            if completionHeap and completionHeap[0][0] < nextTime:
+                nextTime = completionHeap[0][0]
+            if abandonHeap and abandonHeap[0][0] < nextTime:
+                nextTime = abandonHeap[0][0]
+            self.simulationTime = nextTime
+        
+        if not self.dirty:
+            self.dirty = self.busyServerCount > 0
     
     def _checkCompletedServices(self):
         """Check if any servers have completed their service"""
-        for server in self.servers:
-            if server.state == ServerState.BUSY and self.simulationTime >= server.serviceEndTime:
-                # Service completed
-                boothId = server.currentBoothId
-                customer = server.finishService()
-                customer.serviceEndTime = self.simulationTime
-                customer.outcome = 'completed'
-                
-                # Release booth
-                if boothId is not None:
-                    booth = self.booths[boothId]
-                    booth.releaseServer()
-                
-                # Record completed customer
-                self.completedCustomers.append(customer)
-                self.totalCustomersServed += 1
+        # Pop only the services that are due, rather than checking every server each tick
+        completionHeap = self.completionHeap
+        simulationTime = self.simulationTime
+        servers = self.servers
+        while completionHeap and completionHeap[0][0] <= simulationTime:
+            server = servers[heapq.heappop(completionHeap)[1]]
+            # Service completed
+            boothId = server.currentBoothId
+            customer = server.finishService()
+            customer.serviceEndTime = simulationTime
+            customer.outcome = 'completed'
+            self.busyServerCount -= 1
+            
+            # Release booth
+            if boothId is not None:
+                booth = self.booths[boothId]
+                booth.releaseServer()
+                self.occupiedBoothCount -= 1
+            
+            # Record completed customer
+            self.completedCustomers.append(customer)
+            self.totalCustomersServed += 1
+            self.serviceServedCount[customer.serviceType] += 1
+            self.serviceWaitSum[customer.serviceType] += customer.waitDuration
+            self.totalWaitSum += customer.waitDuration
+            columns = self.completedColumns
+            columns['arrivalTime'].append(customer.arrivalTime)
+            columns['queueJoinTime'].append(customer.queueJoinTime)
+            columns['serviceStartTime'].append(customer.serviceStartTime)
+            columns['serviceEndTime'].append(customer.serviceEndTime)
+            columns['serverId'].append(customer.serverId)
+            self.totalServiceSum += customer.serviceEndTime - customer.serviceStartTime
+            self.dirty = True
     
     def _checkAbandonments(self):
         """Check if any customers abandon the queue"""
-        for serviceType, queue in self.queues.items():
-            customersToRemove = []
-            
+        # Each customer's give-up time is drawn on arrival, so only those now due are
+        # looked at; entries for customers already being served are just dropped.
+        # With abandonment disabled, due customers stay (and their entries are dropped;
+        # re-enabling redraws their give-up times)
+        simulationTime = self.simulationTime
+        abandonHeap = self.abandonHeap
+        heappop = heapq.heappop
+        enabled = self.abandonmentEnabled
+        abandoned = []
+        while abandonHeap and abandonHeap[0][0] <= simulationTime:
+            customer = heappop(abandonHeap)[2]
+            if customer.serviceStartTime is not None:
+                self.abandonHeapStale -= 1
+            elif enabled:
+                customer.outcome = 'abandoned'
+                customer.serviceEndTime = simulationTime
+                abandoned.append(customer)
+        
+        if not abandoned:
+            return
+        
+        # Leave abandoners in place as tombstones; compact a queue only once they
+        # make up more than half of it
+        queueTombstones = self.queueTombstones
+        for customer in abandoned:
+            queueTombstones[customer.serviceType] += 1
+        for serviceType in {customer.serviceType for customer in abandoned}:
+            queue = self.queues[serviceType]
+            if queueTombstones[serviceType] * 2 > len(queue):
+                kept = [customer for customer in queue if customer.outcome is None]
+                queue.clear()
+                queue.extend(kept)
+                queueTombstones[serviceType] = 0
+        self.abandonedCustomers.extend(abandoned)
+        self.totalCustomersAbandoned += len(abandoned)
+        self.dirty = True
+    
+    def _redrawAbandonTimes(self):
+        """Reschedule abandonment for waiting customers whose give-up time passed while it was disabled"""
+        # Entries that fell due while disabled were dropped; redraw those customers'
+        # give-up times conditional on having waited this long, and keep everyone else's
+        simulationTime = self.simulationTime
+        expovariate = self.rng.expovariate
+        abandonHeap = []
+        for queue in self.queueList:
             for customer in queue:
-                waitTime = self.simulationTime - customer.queueJoinTime
-                
-                # Abandonment probability increases with wait time
-                abandonProb = 0.0
-                if waitTime > 5.0:
-                    abandonProb = 0.05 * (waitTime - 5.0)  # 5% per minute after 5 min
-                if waitTime > 10.0:
-                    abandonProb = 0.15 * (waitTime - 5.0)  # 15% per minute after 10 min
-                
-                abandonProb = min(abandonProb, 0.5)  # Cap at 50%
-                
-                if random.random() < abandonProb * (1.0 / self.timeAcceleration):
-                    customer.outcome = 'abandoned'
-                    customer.serviceEndTime = self.simulationTime
-                    customersToRemove.append(customer)
-                    self.abandonedCustomers.append(customer)
-                    self.totalCustomersAbandoned += 1
-            
-            # Remove abandoned customers
-            for customer in customersToRemove:
-                queue.remove(customer)
+                if customer.outcome is not None:
+                    continue
+                if customer.abandonTime <= simulationTime:
+                    exposure = cumulativeAbandonHazard(simulationTime - customer.queueJoinTime)
+                    customer.abandonTime = customer.queueJoinTime + abandonmentDelay(exposure + expovariate(1.0))
+                abandonHeap.append((customer.abandonTime, customer.customerId, customer))
+        heapq.heapify(abandonHeap)
+        self.abandonHeap[:] = abandonHeap
+        self.abandonHeapStale = 0
+    
+    def _liveQueue(self, queue):
+        """Drop abandoned customers from the front of a queue and return it (empty if nobody is left)"""
+        while queue and queue[0].outcome is not None:
+            self.queueTombstones[queue.popleft().serviceType] -= 1
+        return queue
     
     def _assignServersToCustomers(self):
         """Assign available servers to waiting customers"""
         # Find available servers and booths
-        availableServers = [s for s in self.servers if s.isAvailable()]
-        availableBooths = [b for b in self.booths if b.isAvailable()]
+        availableServers = [s for s in self.servers if s.available]
+        availableBooths = [b for b in self.booths if not b.occupied]
+        
+        rngRandom = self.rng.random
         
-        # While we have both available servers and booths, and customers waiting
-        while availableServers and availableBooths:
+        # Pair free servers with free booths in id order while customers are waiting
+        for server, booth in zip(availableServers, availableBooths):
             # Select next customer based on dispatch strategy
             customer = self._selectNextCustomer()
             
             if customer is None:
                 break  # No more customers waiting
             
-            # Assign server and booth
-            server = availableServers.pop(0)
-            booth = availableBooths.pop(0)
-            
             # Calculate service end time
             serviceTime = self.serviceTimes.get(customer.serviceType, 3.0)
-            # Add some randomness (±20%)
-            serviceTime *= random.uniform(0.8, 1.2)
+            # Add some randomness (±20%); the same draw as rng.uniform(0.8, 1.2) without its call overhead
+            serviceTime *= 0.8 + 0.4 * rngRandom()
             serviceEndTime = self.simulationTime + serviceTime
             
             # Update customer
             customer.serviceStartTime = self.simulationTime
+            customer.waitDuration = self.simulationTime - customer.queueJoinTime
             customer.serverId = server.serverId
             customer.boothId = booth.boothId
             
             # Update server and booth
             server.startService(customer, booth.boothId, serviceEndTime)
+            heapq.heappush(self.completionHeap, (serviceEndTime, server.serverId))
             booth.assignServer(server.serverId)
-    
-    def _selectNextCustomer(self):
-        """Select next customer to serve based on dispatch strategy"""
-        if self.dispatchStrategy == DispatchStrategy.LONGEST_WAIT_FIRST:
-            return self._selectLongestWaitFirst()
-        elif self.dispatchStrategy == DispatchStrategy.SHORTEST_JOB_FIRST:
-            return self._selectShortestJobFirst()
-        elif self.dispatchStrategy == DispatchStrategy.ROUND_ROBIN:
-            return self._selectRoundRobin()
-        elif self.dispatchStrategy == DispatchStrategy.PRIORITY_ORDER:
-            return self._selectPriorityOrder()
-        else:
-            return self._selectLongestWaitFirst()
+            self.busyServerCount += 1
+            self.occupiedBoothCount += 1
+            if customer.abandonTime > self.simulationTime:
+                self.abandonHeapStale += 1  # Its entry is still queued (due ones were just popped)
+            self.dirty = True
+        
+        # Served customers' abandonment entries are normally dropped when they fall due;
+        # once they make up over half the heap, rebuild it with only the waiting customers
+        abandonHeap = self.abandonHeap
+        if self.abandonHeapStale * 2 > len(abandonHeap):
+            abandonHeap[:] = [entry for entry in abandonHeap if entry[2].serviceStartTime is None]
+            heapq.heapify(abandonHeap)
+            self.abandonHeapStale = 0
     
     def _selectLongestWaitFirst(self):
         """Select customer who has waited longest across all queues"""
-        longestWaitCustomer = None
-        longestWaitTime = -1
-        selectedQueue = None
-        
-        for serviceType, queue in self.queues.items():
-            if queue:
-                customer = queue[0]
-                waitTime = self.simulationTime - customer.queueJoinTime
-                if waitTime > longestWaitTime:
-                    longestWaitTime = waitTime
-                    longestWaitCustomer = customer
-                    selectedQueue = queue
-        
-        if longestWaitCustomer:
-            selectedQueue.popleft()
-            return longestWaitCustomer
-        return None
+        # Longest wait is the earliest join time; min keeps the first queue on ties
+        waiting = [queue for queue in self.queueList if self._liveQueue(queue)]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda queue: queue[0].queueJoinTime).popleft()
     
     def _selectShortestJobFirst(self):
         """Select customer with shortest expected service time"""
-        shortestJobCustomer = None
-        shortestJobTime = float('inf')
-        selectedQueue = None
-        
-        for serviceType, queue in self.queues.items():
-            if queue:
-                customer = queue[0]
-                jobTime = self.serviceTimes.get(customer.serviceType, 3.0)
-                if jobTime < shortestJobTime:
-                    shortestJobTime = jobTime
-                    shortestJobCustomer = customer
-                    selectedQueue = queue
-        
-        if shortestJobCustomer:
-            selectedQueue.popleft()
-            return shortestJobCustomer
-        return None
+        waiting = [queue for queue in self.queueList if self._liveQueue(queue)]
+        if not waiting:
+            return None
+        serviceTimes = self.serviceTimes
+        return min(waiting, key=lambda queue: serviceTimes.get(queue[0].serviceType, 3.0)).popleft()
     
     def _selectRoundRobin(self):
         """Select customer in round-robin fashion across service types"""
@@ -332,7 +551,7 @@ class QueueSimulator:
             serviceType = self.serviceTypesList[self.roundRobinIndex]
             self.roundRobinIndex = (self.roundRobinIndex + 1) % len(self.serviceTypesList)
             
-            queue = self.queues[serviceType]
+            queue = self._liveQueue(self.queues[serviceType])
             if queue:
                 return queue.popleft()
             
@@ -345,44 +564,75 @@ class QueueSimulator:
         priorityOrder = ['passports', 'parcels', 'standard_post']
         
         for serviceType in priorityOrder:
-            queue = self.queues[serviceType]
+            queue = self._liveQueue(self.queues[serviceType])
             if queue:
                 return queue.popleft()
         
         return None
     
     def getQueueLengths(self):
-        """Get current queue lengths"""
-        return {serviceType: len(queue) for serviceType, queue in self.queues.items()}
+        """Get current queue lengths (customers still waiting)"""
+        queueTombstones = self.queueTombstones
+        return {serviceType: len(queue) - queueTombstones[serviceType]
+                for serviceType, queue in self.queues.items()}
     
     def getServerStates(self):
-        """Get current server states"""
-        return [
-            {
-                'serverId': s.serverId,
-                'state': s.state.value,
-                'boothId': s.currentBoothId,
-                'customerId': s.currentCustomer.customerId if s.currentCustomer else None,
-                'serviceType': s.currentCustomer.serviceType if s.currentCustomer else None,
-                'timeRemaining': max(0, s.serviceEndTime - self.simulationTime) if s.serviceEndTime else 0
-            }
-            for s in self.servers
-        ]
+        """Get current server states (the returned list and dicts are reused; copy them to keep a snapshot)"""
+        simulationTime = self.simulationTime
+        for s, state in zip(self.servers, self.serverStateCache):
+            customer = s.currentCustomer
+            state['state'] = s.state.value
+            state['boothId'] = s.currentBoothId
+            state['customerId'] = customer.customerId if customer else None
+            state['serviceType'] = customer.serviceType if customer else None
+            state['timeRemaining'] = max(0, s.serviceEndTime - simulationTime) if s.serviceEndTime else 0
+        return self.serverStateCache
     
     def getBoothStates(self):
-        """Get current booth states"""
-        return [
-            {
-                'boothId': b.boothId,
-                'occupied': b.occupied,
-                'serverId': b.serverId
-            }
-            for b in self.booths
-        ]
+        """Get current booth states, including what the booth's server is doing (reused like getServerStates)"""
+        for state, occupied, serverId, serviceType, timeRemaining in zip(self.boothStateCache, *self.getBoothColumns()):
+            state['occupied'] = occupied
+            state['serverId'] = serverId
+            state['serviceType'] = serviceType
+            state['timeRemaining'] = timeRemaining
+        return self.boothStateCache
+    
+    def getBoothColumns(self):
+        """Get booth states column-wise: (occupied, serverIds, serviceTypes, timesRemaining), indexed by boothId"""
+        occupied = []
+        serverIds = []
+        serviceTypes = []
+        timesRemaining = []
+        simulationTime = self.simulationTime
+        for b in self.booths:
+            server = self.servers[b.serverId] if b.serverId is not None else None
+            customer = server.currentCustomer if server else None
+            occupied.append(b.occupied)
+            serverIds.append(b.serverId)
+            serviceTypes.append(customer.serviceType if customer else None)
+            timesRemaining.append(max(0, server.serviceEndTime - simulationTime) if server and server.serviceEndTime else 0)
+        return occupied, serverIds, serviceTypes, timesRemaining
+    
+    def getServerColumns(self):
+        """Get server states column-wise: (states, boothIds, serviceTypes), indexed by serverId"""
+        servers = self.servers
+        return (
+            [s.state.value for s in servers],
+            [s.currentBoothId for s in servers],
+            [s.currentCustomer.serviceType if s.currentCustomer else None for s in servers]
+        )
+    
+    def summarizeServerStates(self):
+        """Get a one-line-per-server text report of server states"""
+        return "\n".join(f"  Server {s.serverId}: {s.state.value}" for s in self.servers)
+    
+    def summarizeBoothStates(self):
+        """Get a one-line-per-booth text report of booth occupancy"""
+        return "\n".join(f"  Booth {b.boothId}: {'Occupied' if b.occupied else 'Available'}" for b in self.booths)
     
     def getStatistics(self):
         """Get simulation statistics"""
-        totalCustomers = len(self.completedCustomers) + len(self.abandonedCustomers)
+        totalCustomers = self.totalCustomersServed + self.totalCustomersAbandoned
         
         if totalCustomers == 0:
             return {
@@ -391,11 +641,16 @@ class QueueSimulator:
                 'totalAbandoned': 0,
                 'avgWaitTime': 0,
                 'avgServiceTime': 0,
+                'busyServers': self.busyServerCount,
+                'occupiedBooths': self.occupiedBoothCount,
+                'serverCount': self.numServers,
+                'boothCount': self.numBooths,
                 'simulationTime': self.simulationTime
             }
         
-        avgWaitTime = sum(c.getWaitDuration() or 0 for c in self.completedCustomers) / max(len(self.completedCustomers), 1)
-        avgServiceTime = sum(c.getServiceDuration() or 0 for c in self.completedCustomers) / max(len(self.completedCustomers), 1)
+        served = max(self.totalCustomersServed, 1)
+        avgWaitTime = self.totalWaitSum / served
+        avgServiceTime = self.totalServiceSum / served
         
         return {
             'totalCustomers': totalCustomers,
@@ -403,14 +658,34 @@ class QueueSimulator:
             'totalAbandoned': self.totalCustomersAbandoned,
             'avgWaitTime': avgWaitTime,
             'avgServiceTime': avgServiceTime,
+            'busyServers': self.busyServerCount,
+            'occupiedBooths': self.occupiedBoothCount,
+            'serverCount': self.numServers,
+            'boothCount': self.numBooths,
             'simulationTime': self.simulationTime
         }
     
+    def getCompletedColumns(self):
+        """Get the served-customer history as columns {name: array}, one entry per customer"""
+        return self.completedColumns
+    
+    def getWaitTimePercentile(self, percent):
+        """Get the given percentile (0-100) of served customers' wait times, interpolating linearly"""
+        columns = self.completedColumns
+        if not columns['serviceStartTime']:
+            return 0.0
+        waits = sorted(map(sub, columns['serviceStartTime'], columns['queueJoinTime']))
+        position = (len(waits) - 1) * percent / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(waits) - 1)
+        return waits[lower] + (waits[upper] - waits[lower]) * (position - lower)
+    
     def reset(self):
         """Reset simulation to initial state"""
         # Reset servers
         for server in self.servers:
             server.state = ServerState.SPARE
+            server.available = True
             server.currentCustomer = None
             server.currentBoothId = None
             server.serviceEndTime = None
@@ -427,8 +702,22 @@ class QueueSimulator:
         # Reset statistics
         self.simulationTime = 0.0
         self.lastUpdateTime = None
+        self.completionHeap.clear()
+        self.abandonHeap.clear()
+        self.abandonHeapStale = 0
         self.totalCustomersServed = 0
         self.totalCustomersAbandoned = 0
-        self.completedCustomers = []
-        self.abandonedCustomers = []
-        Customer._nextId = 1
\ No newline at end of file
+        self.completedCustomers.clear()
+        self.abandonedCustomers.clear()
+        self.totalWaitSum = 0.0
+        self.totalServiceSum = 0.0
+        for column in self.completedColumns.values():
+            del column[:]
+        self.busyServerCount = 0
+        self.occupiedBoothCount = 0
+        for serviceType in self.queues:
+            self.queueTombstones[serviceType] = 0
+            self.serviceServedCount[serviceType] = 0
+            self.serviceWaitSum[serviceType] = 0.0
+        Customer._nextId = 1
+        self.dirty = True
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Headless driver for the Queue Simulator
+Advances a simulator without a GUI or any output, for tests and batch runs
+"""
+
+import time
+
+# Tick interval used when following the wall clock, in real seconds
+REALTIME_TICK = 0.05
+
+def runFor(simulator, realSeconds, realtime=False):
+    """Run the simulator for the simulated time realSeconds covers at its acceleration"""
+    simulator.running = True
+    if realtime:
+        # Tick against the wall clock, as the GUI does
+        update = simulator.update
+        sleep = time.sleep
+        perfCounter = time.perf_counter
+        deadline = perfCounter() + realSeconds
+        while perfCounter() < deadline:
+            update()
+            sleep(REALTIME_TICK)
+    else:
+        # Jump through the same span of simulated time from event to event
+        simulator.runUntil(simulator.simulationTime + realSeconds * simulator.timeAcceleration / 60.0)
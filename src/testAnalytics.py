@@ -5,19 +5,23 @@ Run this to see how the analytics dashboard works!
 """
 
 import sqlite3
-import random
+import numpy as np
 from datetime import datetime, timedelta
 import sys
 from PyQt5.QtWidgets import QApplication
 
-def create_sample_database(db_path='queue_analysis.db'):
+def create_sample_database(db_path='queue_analysis.db', seed=42):
     """Create a sample database with test data"""
     
     print("📊 Creating sample database...")
     
-    # Connect to database
+    # Connect to database; it's a throwaway fixture, so trade durability for speed
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    cursor.execute('PRAGMA page_size=4096')
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=OFF')
+    cursor.execute('PRAGMA temp_store=MEMORY')
     
     # Drop existing tables
     cursor.execute('DROP TABLE IF EXISTS events')
@@ -34,8 +38,7 @@ def create_sample_database(db_path='queue_analysis.db'):
         server_id INTEGER,
         queue_length INTEGER,
         light_level INTEGER,
-        temperature REAL,
-        recorded_date TEXT
+        temperature REAL
     )
     ''')
     
@@ -73,60 +76,64 @@ def create_sample_database(db_path='queue_analysis.db'):
     # Generate sample events (30 days of data)
     print("📝 Generating sample events...")
     
+    # Rows are collected in lists and inserted with executemany in one transaction;
+    # each day's random values are drawn as whole NumPy columns
+    cursor.execute('BEGIN')
+    rng = np.random.default_rng(seed)  # Fixed seed, so the sample database is reproducible
+    event_rows = []
     customer_id = 1
     start_date = datetime.now() - timedelta(days=30)
     
     for day in range(30):
         current_date = start_date + timedelta(days=day)
+        day_start = current_date.replace(hour=0, minute=0, second=0).timestamp()
         
         # Simulate 50-150 customers per day
-        num_customers = random.randint(50, 150)
+        n = int(rng.integers(50, 151))
         
-        for _ in range(num_customers):
-            # Random time during business hours (9 AM - 5 PM)
-            hour = random.randint(9, 16)
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            
-            event_time = current_date.replace(hour=hour, minute=minute, second=second)
-            timestamp = event_time.timestamp()
-            
-            # Environmental factors
-            light_level = random.randint(100, 200) if 10 <= hour <= 15 else random.randint(50, 100)
-            temperature = random.uniform(19, 25)
-            queue_length = max(0, random.randint(-2, 8))
-            
-            # Arrival event
-            cursor.execute('''
-                INSERT INTO events (timestamp, event_type, customer_id, queue_length, 
-                                  light_level, temperature, recorded_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (timestamp, 'arrival', customer_id, queue_length, light_level, 
-                  temperature, event_time.strftime('%Y-%m-%d')))
-            
-            # Service start event (after 2-10 minutes)
-            wait_time = random.uniform(2, 10) * 60  # seconds
-            service_start_time = timestamp + wait_time
-            cursor.execute('''
-                INSERT INTO events (timestamp, event_type, customer_id, server_id, 
-                                  queue_length, light_level, temperature, recorded_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (service_start_time, 'service_start', customer_id, random.randint(1, 3),
-                  max(0, queue_length - 1), light_level, temperature, 
-                  event_time.strftime('%Y-%m-%d')))
-            
-            # Service complete event (after 3-7 minutes of service)
-            service_duration = random.uniform(3, 7) * 60  # seconds
-            service_complete_time = service_start_time + service_duration
-            cursor.execute('''
-                INSERT INTO events (timestamp, event_type, customer_id, server_id,
-                                  queue_length, light_level, temperature, recorded_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (service_complete_time, 'service_complete', customer_id, 
-                  random.randint(1, 3), max(0, queue_length - 2), light_level, 
-                  temperature, event_time.strftime('%Y-%m-%d')))
-            
-            customer_id += 1
+        # Random time during business hours (9 AM - 5 PM)
+        hours = rng.integers(9, 17, size=n)
+        timestamps = (day_start + hours * 3600 + rng.integers(0, 60, size=n) * 60
+                      + rng.integers(0, 60, size=n))
+        
+        # Environmental factors
+        light_levels = np.where((hours >= 10) & (hours <= 15),
+                                rng.integers(100, 201, size=n), rng.integers(50, 101, size=n))
+        temperatures = rng.uniform(19, 25, size=n)
+        queue_lengths = np.maximum(0, rng.integers(-2, 9, size=n))
+        
+        # Service starts after 2-10 minutes and takes 3-7 minutes (in seconds)
+        service_start_times = timestamps + rng.uniform(2, 10, size=n) * 60
+        service_complete_times = service_start_times + rng.uniform(3, 7, size=n) * 60
+        start_servers = rng.integers(1, 4, size=n)
+        complete_servers = rng.integers(1, 4, size=n)
+        
+        # Arrival, service start and service complete events for each customer
+        for (cid, timestamp, start_time, complete_time, start_server, complete_server,
+             queue_length, light_level, temperature) in zip(
+                range(customer_id, customer_id + n), timestamps.tolist(),
+                service_start_times.tolist(), service_complete_times.tolist(),
+                start_servers.tolist(), complete_servers.tolist(), queue_lengths.tolist(),
+                light_levels.tolist(), temperatures.tolist()):
+            event_rows.append((timestamp, 'arrival', cid, None, queue_length,
+                               light_level, temperature))
+            event_rows.append((start_time, 'service_start', cid, start_server,
+                               max(0, queue_length - 1), light_level, temperature))
+            event_rows.append((complete_time, 'service_complete', cid, complete_server,
+                               max(0, queue_length - 2), light_level, temperature))
+        
+        customer_id += n
+    
+    cursor.executemany('''
+        INSERT INTO events (timestamp, event_type, customer_id, server_id,
+                          queue_length, light_level, temperature)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', event_rows)
+    
+    # Indexes are built once after the bulk insert rather than maintained row by row;
+    # dates are derived from timestamp when queried
+    cursor.execute('CREATE INDEX idx_events_timestamp ON events(timestamp)')
+    cursor.execute('CREATE INDEX idx_events_customer ON events(customer_id)')
     
     print(f"✓ Generated {customer_id - 1} customer events")
     
@@ -134,44 +141,49 @@ def create_sample_database(db_path='queue_analysis.db'):
     print("🎯 Generating simulation results...")
     
     strategies = ['FIFO', 'LongestWait', 'Priority', 'RoundRobin']
+    run_rows = []
+    result_rows = []
     
     for strategy in strategies:
         for num_servers in range(2, 6):  # 2-5 servers
             for _ in range(5):  # 5 runs per configuration
                 
-                # Insert simulation run
-                cursor.execute('''
-                    INSERT INTO simulation_runs 
-                    (run_timestamp, num_servers, dispatch_strategy, avg_service_time,
-                     arrival_rate, simulation_duration, priority_enabled)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (datetime.now().isoformat(), num_servers, strategy, 
-                      random.uniform(4, 6), random.uniform(1.5, 2.5), 480, 
-                      strategy == 'Priority'))
-                
-                run_id = cursor.lastrowid
+                # The tables were just recreated, so run ids are assigned in order from 1
+                run_id = len(run_rows) + 1
+                run_rows.append((run_id, datetime.now().isoformat(), num_servers, strategy,
+                                 float(rng.uniform(4, 6)), float(rng.uniform(1.5, 2.5)), 480,
+                                 strategy == 'Priority'))
                 
                 # Generate results for this run
                 # LongestWait performs best, FIFO worst
                 base_wait = 6.0 if strategy == 'FIFO' else 4.8 if strategy == 'LongestWait' else 5.5
                 base_wait = base_wait - (num_servers - 2) * 0.8  # More servers = less wait
                 
-                avg_wait = base_wait + random.uniform(-0.5, 0.5)
-                max_wait = avg_wait * random.uniform(2.0, 2.5)
-                p95_wait = avg_wait * random.uniform(1.5, 1.8)
+                avg_wait = base_wait + float(rng.uniform(-0.5, 0.5))
+                max_wait = avg_wait * float(rng.uniform(2.0, 2.5))
+                p95_wait = avg_wait * float(rng.uniform(1.5, 1.8))
                 
-                utilization = min(0.95, 0.50 + (5 - num_servers) * 0.10 + random.uniform(0, 0.10))
-                abandonment = max(0, (avg_wait - 5) * 0.005 + random.uniform(0, 0.02))
+                utilization = min(0.95, 0.50 + (5 - num_servers) * 0.10 + float(rng.uniform(0, 0.10)))
+                abandonment = max(0, (avg_wait - 5) * 0.005 + float(rng.uniform(0, 0.02)))
                 
-                cursor.execute('''
-                    INSERT INTO results
-                    (run_id, avg_wait_time, max_wait_time, percentile_95_wait,
-                     avg_queue_length, max_queue_length, server_utilization,
-                     abandonment_rate, customers_served)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (run_id, avg_wait, max_wait, p95_wait,
-                      avg_wait * 0.5, int(avg_wait * 1.5), utilization,
-                      abandonment, random.randint(450, 550)))
+                result_rows.append((run_id, avg_wait, max_wait, p95_wait,
+                                    avg_wait * 0.5, int(avg_wait * 1.5), utilization,
+                                    abandonment, int(rng.integers(450, 551))))
+    
+    cursor.executemany('''
+        INSERT INTO simulation_runs 
+        (run_id, run_timestamp, num_servers, dispatch_strategy, avg_service_time,
+         arrival_rate, simulation_duration, priority_enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', run_rows)
+    cursor.executemany('''
+        INSERT INTO results
+        (run_id, avg_wait_time, max_wait_time, percentile_95_wait,
+         avg_queue_length, max_queue_length, server_utilization,
+         abandonment_rate, customers_served)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', result_rows)
+    cursor.execute('CREATE INDEX idx_results_run ON results(run_id)')
     
     print(f"✓ Generated {len(strategies) * 4 * 5} simulation results")
     
@@ -5,18 +5,70 @@ Tests basic functionality without GUI
 
 import sys
 import os
-import time
-
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import multiprocessing
 
 from queueSimulator import QueueSimulator, DispatchStrategy
+from simDriver import runFor
+
+# Set POQ_TEST_REALTIME=1 to watch the tests run against the wall clock; by default the
+# simulator jumps straight through the same span of simulated time
+REALTIME = os.environ.get('POQ_TEST_REALTIME') == '1'
+
+_ALL_STRATEGIES = (
+    DispatchStrategy.LONGEST_WAIT_FIRST,
+    DispatchStrategy.SHORTEST_JOB_FIRST,
+    DispatchStrategy.ROUND_ROBIN,
+    DispatchStrategy.PRIORITY_ORDER
+)
+
+# Configuration shared by every strategy run; only the dispatch strategy varies
+STRATEGY_TEST_CONFIG = {
+    'numServers': 5,
+    'numBooths': 4,
+    'timeAcceleration': 200.0,
+    'abandonmentEnabled': False
+}
+
+# Section rules for the test report
+_EQ_LINE = "=" * 60
+_DASH_LINE = "-" * 60
+
+# Arrivals for the basic test, in order
+BASIC_TEST_ARRIVALS = ('standard_post', 'passports', 'parcels', 'standard_post', 'passports')
+
+SERVICE_NAMES = {'standard_post': 'Standard Post', 'passports': 'Passports', 'parcels': 'Parcels'}
+
+class _Log:
+    """Collects a test's output lines and writes them to stdout in one go"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def add(self, text):
+        """Queue a line (or several, newline-separated) for output"""
+        self.lines.append(text)
+    
+    def flush(self):
+        """Write everything queued so far with a single write"""
+        text = "\n".join(self.lines) + "\n"
+        self.lines.clear()
+        if sys.stdout is not sys.__stdout__:
+            # Redirected or captured output has to go through the replacement stream
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        # Straight to the file descriptor, after anything print() still has buffered
+        sys.stdout.flush()
+        data = text.encode(sys.stdout.encoding or 'utf-8')
+        while data:
+            data = data[os.write(sys.stdout.fileno(), data):]
 
 def testBasicSimulation():
     """Test basic simulation functionality"""
-    print("=" * 60)
-    print("Testing Post Office Queue Simulator")
-    print("=" * 60)
+    log = _Log()
+    log.add(_EQ_LINE)
+    log.add("Testing Post Office Queue Simulator")
+    log.add(_EQ_LINE)
     
     # Create simulator
     simulator = QueueSimulator(
@@ -32,130 +84,102 @@ def testBasicSimulation():
         abandonmentEnabled=False  # Disable for deterministic test
     )
     
-    print("\nSimulator initialized:")
-    print(f"  Servers: {simulator.numServers}")
-    print(f"  Booths: {simulator.numBooths}")
-    print(f"  Strategy: {simulator.dispatchStrategy.value}")
-    print(f"  Time Acceleration: {simulator.timeAcceleration}x")
+    log.add("\nSimulator initialized:")
+    log.add(f"  Servers: {simulator.numServers}")
+    log.add(f"  Booths: {simulator.numBooths}")
+    log.add(f"  Strategy: {simulator.dispatchStrategy.value}")
+    log.add(f"  Time Acceleration: {simulator.timeAcceleration}x")
     
     # Add some customers
-    print("\n" + "-" * 60)
-    print("Adding customers to queues...")
-    print("-" * 60)
-    
-    customers = []
-    customers.append(simulator.addCustomer('standard_post'))
-    print("Added customer to Standard Post queue")
-    
-    customers.append(simulator.addCustomer('passports'))
-    print("Added customer to Passports queue")
+    log.add("\n" + _DASH_LINE)
+    log.add("Adding customers to queues...")
+    log.add(_DASH_LINE)
     
-    customers.append(simulator.addCustomer('parcels'))
-    print("Added customer to Parcels queue")
-    
-    customers.append(simulator.addCustomer('standard_post'))
-    print("Added customer to Standard Post queue")
-    
-    customers.append(simulator.addCustomer('passports'))
-    print("Added customer to Passports queue")
+    simulator.addCustomers(BASIC_TEST_ARRIVALS)
+    log.add("Added customers: " + ", ".join(SERVICE_NAMES[serviceType] for serviceType in BASIC_TEST_ARRIVALS))
     
     # Check initial queue lengths
     queueLengths = simulator.getQueueLengths()
-    print(f"\nInitial queue lengths: {queueLengths}")
+    log.add(f"\nInitial queue lengths: {queueLengths}")
     
     # Run simulation for a while
-    print("\n" + "-" * 60)
-    print("Running simulation...")
-    print("-" * 60)
-    
-    simulator.running = True
-    startTime = time.time()
+    log.add("\n" + _DASH_LINE)
+    log.add("Running simulation...")
+    log.add(_DASH_LINE)
     
-    while time.time() - startTime < 5:  # Run for 5 real seconds
-        simulator.update()
-        time.sleep(0.05)
+    runFor(simulator, 5, REALTIME)  # 5 real seconds' worth
     
     # Get final statistics
-    print("\n" + "=" * 60)
-    print("Simulation Results")
-    print("=" * 60)
+    log.add("\n" + _EQ_LINE)
+    log.add("Simulation Results")
+    log.add(_EQ_LINE)
     
     stats = simulator.getStatistics()
-    print(f"\nSimulation Time: {stats['simulationTime']:.2f} minutes")
-    print(f"Total Customers: {stats['totalCustomers']}")
-    print(f"Customers Served: {stats['totalServed']}")
-    print(f"Customers Abandoned: {stats['totalAbandoned']}")
-    print(f"Average Wait Time: {stats['avgWaitTime']:.2f} minutes")
-    print(f"Average Service Time: {stats['avgServiceTime']:.2f} minutes")
+    simulationTime, totalCustomers, served, abandoned, avgWait, avgService = map(stats.get, (
+        'simulationTime', 'totalCustomers', 'totalServed', 'totalAbandoned', 'avgWaitTime', 'avgServiceTime'))
+    log.add(f"""
+Simulation Time: {simulationTime:.2f} minutes
+Total Customers: {totalCustomers}
+Customers Served: {served}
+Customers Abandoned: {abandoned}
+Average Wait Time: {avgWait:.2f} minutes
+Average Service Time: {avgService:.2f} minutes""")
     
     # Final queue lengths
     finalQueueLengths = simulator.getQueueLengths()
-    print(f"\nFinal queue lengths: {finalQueueLengths}")
+    log.add(f"\nFinal queue lengths: {finalQueueLengths}")
     
     # Server states
-    print("\nServer States:")
-    serverStates = simulator.getServerStates()
-    for server in serverStates:
-        print(f"  Server {server['serverId']}: {server['state']}")
+    log.add("\nServer States:")
+    log.add(simulator.summarizeServerStates())
     
     # Booth states
-    print("\nBooth States:")
-    boothStates = simulator.getBoothStates()
-    for booth in boothStates:
-        status = "Occupied" if booth['occupied'] else "Available"
-        print(f"  Booth {booth['boothId']}: {status}")
+    log.add("\nBooth States:")
+    log.add(simulator.summarizeBoothStates())
     
-    print("\n" + "=" * 60)
-    print("Test Complete!")
-    print("=" * 60)
+    log.add("\n" + _EQ_LINE)
+    log.add("Test Complete!")
+    log.add(_EQ_LINE)
+    log.flush()
+
+
+def runStrategy(strategy):
+    """Run the 7-customer scenario under one strategy; returns (strategy name, statistics)"""
+    # A fresh simulator per strategy: __init__ is cheaper than copying a prototype
+    simulator = QueueSimulator(dispatchStrategy=strategy, **STRATEGY_TEST_CONFIG)
+    
+    # Add multiple customers
+    simulator.addCustomers(['standard_post'] * 3 + ['passports'] * 2 + ['parcels'] * 2)
+    
+    # Run simulation
+    runFor(simulator, 3, REALTIME)
+    
+    return strategy.value, simulator.getStatistics()
 
 
 def testDispatchStrategies():
     """Test different dispatch strategies"""
-    print("\n" + "=" * 60)
-    print("Testing Different Dispatch Strategies")
-    print("=" * 60)
-    
-    strategies = [
-        DispatchStrategy.LONGEST_WAIT_FIRST,
-        DispatchStrategy.SHORTEST_JOB_FIRST,
-        DispatchStrategy.ROUND_ROBIN,
-        DispatchStrategy.PRIORITY_ORDER
-    ]
-    
-    for strategy in strategies:
-        print(f"\n{'-' * 60}")
-        print(f"Testing: {strategy.value}")
-        print(f"{'-' * 60}")
-        
-        simulator = QueueSimulator(
-            numServers=5,
-            numBooths=4,
-            dispatchStrategy=strategy,
-            timeAcceleration=200.0,
-            abandonmentEnabled=False
-        )
-        
-        # Add multiple customers
-        for _ in range(3):
-            simulator.addCustomer('standard_post')
-        for _ in range(2):
-            simulator.addCustomer('passports')
-        for _ in range(2):
-            simulator.addCustomer('parcels')
-        
-        print(f"Added 7 customers total")
-        
-        # Run simulation
-        simulator.running = True
-        startTime = time.time()
-        
-        while time.time() - startTime < 3:
-            simulator.update()
-            time.sleep(0.05)
-        
-        stats = simulator.getStatistics()
-        print(f"Served: {stats['totalServed']}, Avg Wait: {stats['avgWaitTime']:.2f} min")
+    log = _Log()
+    log.add("\n" + _EQ_LINE)
+    log.add("Testing Different Dispatch Strategies")
+    log.add(_EQ_LINE)
+    
+    # Realtime runs mostly sleep, so run the strategies side by side in separate processes
+    # (one each, whatever the core count); simulated-time runs finish faster than a pool starts
+    if REALTIME:
+        with multiprocessing.Pool(processes=len(_ALL_STRATEGIES)) as pool:
+            results = pool.map(runStrategy, _ALL_STRATEGIES)
+    else:
+        results = [runStrategy(strategy) for strategy in _ALL_STRATEGIES]
+    
+    for strategyName, stats in results:
+        log.add("\n" + _DASH_LINE)
+        log.add(f"Testing: {strategyName}")
+        log.add(_DASH_LINE)
+        log.add("Added 7 customers total")
+        log.add(f"Served: {stats['totalServed']}, Avg Wait: {stats['avgWaitTime']:.2f} min")
+    log.flush()
+
 
 
 if __name__ == '__main__':
@@ -163,6 +187,6 @@ if __name__ == '__main__':
     testBasicSimulation()
     testDispatchStrategies()
     
-    print("\n" + "=" * 60)
+    print("\n" + _EQ_LINE)
     print("All tests completed successfully!")
-    print("=" * 60)
+    print(_EQ_LINE)